@@ -1,61 +1,72 @@
 import anchorpoint as ap
 import apsync as aps
 import os
-import tempfile
+import shutil
 
-import subprocess, sys
+import png_conversion
+from png_cache import ConversionCache, cache_root, copy_or_link
 
-def run_hidden(cmd):
-    startupinfo = None
-    if sys.platform.startswith("win"):
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-    return subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
-
-
-def convert_with_imagemagick(input_path, temp_dir):
-    action_root = os.path.dirname(__file__)
-    magick_path = os.path.join(action_root, "tools", "imagemagick", "magick.exe")
-
-    if not os.path.exists(magick_path):
-        print(f"ERROR: magick.exe not found at {magick_path}")
-        return None
-
-    output_path = os.path.join(temp_dir, os.path.splitext(os.path.basename(input_path))[0] + ".png")
-
-    result = run_hidden([magick_path, f"{input_path}[0]", output_path])
-    if result.returncode != 0:
-        print("ImageMagick error:", result.stderr)
-        return None
-
-    return output_path
+def clipboard_dir():
+    # One fixed folder that is emptied on every run instead of a new temp dir each time
+    path = os.path.join(cache_root(), "clipboard")
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    return path
 
 def copy_images_to_clipboard(workspace_id, file_paths):
     progress = ap.Progress("Generating PNGs", infinite=False)
     progress.set_cancelable(True)
 
     ui = ap.UI()
-    temp_dir = tempfile.mkdtemp()
+    cache = ConversionCache.from_settings(aps.Settings("png_cache"))
+    temp_dir = clipboard_dir()
     png_paths = []
 
     total = len(file_paths)
-    for i, input_path in enumerate(file_paths):
-        if progress.canceled:
-            progress.finish()
-            ui.show_info("Process Canceled", "PNG generation was interrupted by the user.")
-            return
-
-        filename = os.path.basename(input_path)
-        progress.set_text(f"Processing {filename}")
-        print(f"Processing: {input_path}")
-
-        png_path = convert_with_imagemagick(input_path, temp_dir)
-        if png_path:
-            png_paths.append(png_path)
-
-        progress.report_progress((i + 1) / total)
-
-    progress.finish()
+    done = 0
+
+    def report(input_path):
+        progress.set_text(f"Processed {os.path.basename(input_path)} ({done}/{total})")
+        progress.report_progress(done / total)
+
+    jobs = []
+    cache_keys = {}
+    for input_path in file_paths:
+        png_path = os.path.join(temp_dir, os.path.splitext(os.path.basename(input_path))[0] + ".png")
+        key = cache.key(input_path)
+        cached = cache.get(key)
+        if cached:
+            try:
+                copy_or_link(cached, png_path)
+                png_paths.append(png_path)
+                done += 1
+                report(input_path)
+                continue
+            except OSError as e:
+                print(f"Could not copy cached PNG for {input_path}: {e}")
+        cache_keys[input_path] = key
+        jobs.append((input_path, png_path))
+
+    # Closing the generator kills the magick processes and shuts the workers down, also on errors
+    conversions = png_conversion.convert_files(jobs, 0, lambda: progress.canceled)
+    try:
+        for input_path, png_path, ok, error in conversions:
+            done += 1
+            if ok:
+                png_paths.append(png_path)
+                cache.put(cache_keys.get(input_path), png_path)
+            else:
+                print(f"ImageMagick error for {input_path}:", error)
+            report(input_path)
+    finally:
+        conversions.close()
+        cache.evict()
+        canceled = progress.canceled
+        progress.finish()
+
+    if canceled:
+        ui.show_info("Process Canceled", "PNG generation was interrupted by the user.")
+        return
 
     if png_paths:
         ap.copy_files_to_clipboard(png_paths)
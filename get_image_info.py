@@ -7,55 +7,165 @@ PngImagePlugin.MAX_TEXT_CHUNK = LARGE_ENOUGH_NUMBER * (1024**2)
 from PIL import Image
 from pymediainfo import MediaInfo
 from psd_tools import PSDImage
+import fnmatch
 import os
+import sqlite3
+import struct
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import tempfile
 import shutil
-import subprocess
-import sys
 
-def run_hidden(cmd):
-    startupinfo = None
-    if sys.platform.startswith("win"):
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-    return subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
+import png_conversion
+import video_probe
+from image_info_index import DEFAULT_EXCLUDE_PATTERNS, MetadataIndex
 
-def extract_resolution_via_temp_png(file_path):
-    try:
-        temp_dir = tempfile.mkdtemp()
-        temp_png = os.path.join(temp_dir, "temp_resolution.png")
-
-        action_root = os.path.dirname(__file__)
-        magick_path = os.path.join(action_root, "tools", "imagemagick", "magick.exe")
-
-        if not os.path.exists(magick_path):
-            print(f"magick.exe not found at: {magick_path}")
-            return "Unknown"
+def extract_resolutions_via_temp_png(file_paths, canceled=None):
+    """Render files to temp PNGs in one ImageMagick batch and read their DPI."""
+    resolutions = {}
+    temp_dir = tempfile.mkdtemp()
+    jobs = [(path, os.path.join(temp_dir, f"temp_resolution_{i}.png")) for i, path in enumerate(file_paths)]
 
-        result = run_hidden([magick_path, f"{file_path}[0]", temp_png])
-        if result.returncode != 0 or not os.path.exists(temp_png):
-            print("ImageMagick conversion failed:", result.stderr)
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            return "Unknown"
-
-        with Image.open(temp_png) as img:
-            dpi = img.info.get("dpi")
-            dpi_val = round(dpi[0]) if dpi else 72
-
-        os.remove(temp_png)
+    try:
+        for file_path, temp_png, ok, error in png_conversion.convert_files(jobs, canceled=canceled, native=False):
+            if not ok or not os.path.exists(temp_png):
+                print("ImageMagick conversion failed:", error)
+                resolutions[file_path] = "Unknown"
+                continue
+
+            try:
+                with Image.open(temp_png) as img:
+                    dpi = img.info.get("dpi")
+                    dpi_val = round(dpi[0]) if dpi else 72
+                resolutions[file_path] = f"{dpi_val} DPI"
+            except Exception as e:
+                print(f"Error extracting resolution via temp PNG: {e}")
+                resolutions[file_path] = "Unknown"
+    finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
 
-        return f"{dpi_val} DPI"
+    return resolutions
 
-    except Exception as e:
-        print(f"Error extracting resolution via temp PNG: {e}")
-        return "Unknown"
+def extract_resolution_via_temp_png(file_path):
+    return extract_resolutions_via_temp_png([file_path]).get(file_path, "Unknown")
+
+SUPPORTED_SUFFIXES = [".png", ".jpg", ".jpeg", ".psd", ".psb", ".mp4", ".mov"]
+DEFAULT_VIDEO_TIMEOUT = 30.0
+
+# PSB stores these tagged blocks with an 8 byte length
+PSB_LONG_LENGTH_KEYS = {b"LMsk", b"Lr16", b"Lr32", b"Layr", b"Mt16", b"Mt32", b"Mtrn", b"Alph", b"FMsk", b"lnk2", b"FEid", b"FXid", b"PxSD"}
+RESOURCE_SIGNATURES = {b"8BIM", b"MeSa", b"AgHg", b"PHUT", b"DCSR"}
+RESOLUTION_INFO_ID = 0x03ED
+
+def _read(f, fmt):
+    size = struct.calcsize(fmt)
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file")
+    return struct.unpack(fmt, data)
+
+def _count_psd_layers(f, version):
+    """Count layer records, minus the hidden records that close a group (like psd.descendants())."""
+    length_fmt = ">I" if version == 1 else ">Q"
+    (layer_mask_length,) = _read(f, length_fmt)
+    if layer_mask_length == 0:
+        return 0
+    (layer_info_length,) = _read(f, length_fmt)
+    if layer_info_length == 0:
+        # 16/32 bit documents keep their layers in a global Lr16/Lr32 block
+        return None
+
+    (count,) = _read(f, ">h")
+    count = abs(count)
+    channel_info_size = 6 if version == 1 else 10
+    dividers = 0
+
+    for _ in range(count):
+        f.seek(16, os.SEEK_CUR)  # bounds
+        (channels,) = _read(f, ">H")
+        f.seek(channels * channel_info_size + 12, os.SEEK_CUR)  # channel info, blend mode, opacity, flags
+        (extra_length,) = _read(f, ">I")
+        extra_end = f.tell() + extra_length
+
+        (mask_length,) = _read(f, ">I")
+        f.seek(mask_length, os.SEEK_CUR)
+        (blending_length,) = _read(f, ">I")
+        f.seek(blending_length, os.SEEK_CUR)
+        (name_length,) = _read(f, ">B")
+        f.seek(((name_length + 4) & ~3) - 1, os.SEEK_CUR)  # pascal string padded to 4 bytes
+
+        while f.tell() + 12 <= extra_end:
+            signature = f.read(4)
+            if signature not in (b"8BIM", b"8B64"):
+                break
+            key = f.read(4)
+            (length,) = _read(f, ">Q" if version == 2 and key in PSB_LONG_LENGTH_KEYS else ">I")
+            block_end = f.tell() + length
+            if key in (b"lsct", b"lsdk") and length >= 4:
+                (divider_type,) = _read(f, ">I")
+                if divider_type == 3:
+                    dividers += 1
+            f.seek(block_end)
+        f.seek(extra_end)
+
+    return count - dividers
+
+def read_psd_header(file_path):
+    """Read size, DPI and layer count of a PSD/PSB without decoding any pixel data.
+
+    Only the file header, the image resources and the layer records are read; channel
+    image data is skipped with seeks. Returns None if the file cannot be parsed."""
+    try:
+        with open(file_path, "rb") as f:
+            signature, version = _read(f, ">4sH")
+            if signature != b"8BPS" or version not in (1, 2):
+                return None
+            f.seek(6, os.SEEK_CUR)  # reserved
+            _channels, height, width, _depth, _mode = _read(f, ">HIIHH")
+            info = {"width": width, "height": height, "dpi": None, "layer_count": None}
+
+            (color_mode_length,) = _read(f, ">I")
+            f.seek(color_mode_length, os.SEEK_CUR)
+
+            (resources_length,) = _read(f, ">I")
+            resources_end = f.tell() + resources_length
+            while f.tell() + 12 <= resources_end:
+                if f.read(4) not in RESOURCE_SIGNATURES:
+                    break
+                resource_id, name_length = _read(f, ">HB")
+                f.seek(name_length + (1 - name_length % 2), os.SEEK_CUR)  # pascal string padded to even
+                (size,) = _read(f, ">I")
+                data_end = f.tell() + size + size % 2
+                if resource_id == RESOLUTION_INFO_ID and size >= 16:
+                    # hRes is always pixels per inch (16.16 fixed); hResUnit is only the display unit
+                    (h_res,) = _read(f, ">I")
+                    info["dpi"] = h_res / 65536.0
+                f.seek(data_end)
+            f.seek(resources_end)
+
+            info["layer_count"] = _count_psd_layers(f, version)
+            return info
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Could not read PSD header of {file_path}: {e}")
+        return None
 
 def extract_image_info(file_path, workspace_id, settings):
     suffix = file_path.lower().split('.')[-1]
 
     try:
         if suffix in ["psb", "psd"]:
+            header = read_psd_header(file_path)
+            if header and header["layer_count"] is not None:
+                result = {
+                    "Dimensions": f"{header['width']} x {header['height']}",
+                    "Layer Count": str(header["layer_count"]),
+                }
+                if settings.get("show_resolution", True):
+                    result["Resolution"] = f"{round(header['dpi']) if header['dpi'] else 72} DPI"
+                return result
+
+            # Fall back to a full parse for files the header reader does not handle
             psd = PSDImage.open(file_path)
             width, height = psd.size
             layer_count = len(list(psd.descendants()))
@@ -66,7 +176,10 @@ def extract_image_info(file_path, workspace_id, settings):
             }
 
             if settings.get("show_resolution", True):
-                result["Resolution"] = extract_resolution_via_temp_png(file_path)
+                if header and header["dpi"]:
+                    result["Resolution"] = f"{round(header['dpi'])} DPI"
+                else:
+                    result["Resolution"] = extract_resolution_via_temp_png(file_path)
 
             return result
 
@@ -87,98 +200,291 @@ def extract_image_info(file_path, workspace_id, settings):
         print(f"Error reading image {file_path}: {e}")
         return {}
 
-def extract_video_info(file_path):
+def format_video_info(width, height, frame_rate, bit_rate, duration_ms):
+    dimensions = f"{width} x {height}" if width and height else "Unknown"
+    frame_rate = f"{float(frame_rate):.2f} fps" if frame_rate else "Unknown"
+    bitrate = f"{int(bit_rate) // 1000} kbps" if bit_rate else "Unknown"
+    duration_sec = (duration_ms or 0) / 1000
+    minutes = int(duration_sec // 60)
+    seconds = int(duration_sec % 60)
+    duration = f"{minutes:02}:{seconds:02}" if duration_sec else "Unknown"
+    return {
+        "Dimensions": dimensions,
+        "Frame Rate": frame_rate,
+        "Bitrate": bitrate,
+        "Duration": duration
+    }
+
+def extract_video_info_mediainfo(file_path):
+    media_info = MediaInfo.parse(file_path)
+    for track in media_info.tracks:
+        if track.track_type == "Video":
+            return format_video_info(track.width, track.height, track.frame_rate, track.bit_rate, track.duration)
+    return {}
+
+def extract_video_info(file_path, timeout=None):
+    """Read video attributes from the MP4/MOV headers, falling back to MediaInfo.
+
+    Each step gets at most timeout seconds so a stalled network read cannot block the scan."""
+    deadline = time.monotonic() + timeout if timeout else None
+
+    def remaining():
+        return max(0.1, deadline - time.monotonic()) if deadline else None
+
     try:
-        media_info = MediaInfo.parse(file_path)
-        for track in media_info.tracks:
-            if track.track_type == "Video":
-                width = track.width or 0
-                height = track.height or 0
-                dimensions = f"{width} x {height}" if width and height else "Unknown"
-                frame_rate = f"{float(track.frame_rate):.2f} fps" if track.frame_rate else "Unknown"
-                bitrate = f"{int(track.bit_rate) // 1000} kbps" if track.bit_rate else "Unknown"
-                duration_sec = (track.duration or 0) / 1000
-                minutes = int(duration_sec // 60)
-                seconds = int(duration_sec % 60)
-                duration = f"{minutes:02}:{seconds:02}" if duration_sec else "Unknown"
-                return {
-                    "Dimensions": dimensions,
-                    "Frame Rate": frame_rate,
-                    "Bitrate": bitrate,
-                    "Duration": duration
-                }
+        finished, info = video_probe.call_with_timeout(video_probe.probe_mp4, (file_path,), remaining())
+        if finished and info:
+            return format_video_info(info["width"], info["height"], info["frame_rate"], info["bit_rate"], info["duration"])
+    except Exception as e:
+        print(f"Could not read video headers of {file_path}: {e}")
+        finished = True
+
+    if not finished:
+        print(f"Timed out reading video {file_path}")
         return {}
+
+    try:
+        finished, result = video_probe.call_with_timeout(extract_video_info_mediainfo, (file_path,), remaining())
+        if not finished:
+            print(f"Timed out reading video {file_path}")
+            return {}
+        return result
     except Exception as e:
         print(f"Error reading video {file_path}: {e}")
         return {}
 
-def set_attributes(file_path, attributes, ctx, settings):
-    api = aps.get_api()
-    api.set_workspace(ctx.workspace_id)
+def extract_file_info(file_path, workspace_id, settings):
+    suffix = os.path.splitext(file_path)[1].lower()
+    print(f"Processing {file_path}")
 
-    for name, value in attributes.items():
-        key_map = {
-            "Dimensions": "show_video_dimensions" if file_path.lower().endswith(('.mp4', '.mov')) else "show_dimensions",
-            "Resolution": "show_resolution",
-            "Frame Rate": "show_frame_rate",
-            "Bitrate": "show_bitrate",
-            "Duration": "show_duration",
-            "Layer Count": "show_layer_count"
-        }
+    if suffix in [".png", ".jpg", ".jpeg", ".psd", ".psb"]:
+        return extract_image_info(file_path, workspace_id, settings)
+    elif suffix in [".mp4", ".mov"]:
+        return extract_video_info(file_path, settings.get("video_timeout", DEFAULT_VIDEO_TIMEOUT))
 
-        key = key_map.get(name)
-        if not key or not settings.get(key, True):
-            continue
+    print(f"Unsupported file type: {suffix}")
+    return None
 
-        print(f"Setting {name} = {value}")
-        api.attributes.set_attribute_value(file_path, name, value)
+def get_video_timeout(settings):
+    try:
+        return max(1.0, float(settings.get("video_timeout", DEFAULT_VIDEO_TIMEOUT)))
+    except (TypeError, ValueError):
+        return DEFAULT_VIDEO_TIMEOUT
+
+def get_worker_count(settings):
+    try:
+        configured = int(settings.get("max_workers", 0) or 0)
+    except (TypeError, ValueError):
+        configured = 0
+    if configured <= 0:
+        # Mostly waiting on disk, network and subprocesses, so use more threads than cores
+        configured = min(16, (os.cpu_count() or 4) * 2)
+    return max(1, configured)
+
+ATTRIBUTE_SETTINGS = {
+    "Dimensions": "show_dimensions",
+    "Resolution": "show_resolution",
+    "Frame Rate": "show_frame_rate",
+    "Bitrate": "show_bitrate",
+    "Duration": "show_duration",
+    "Layer Count": "show_layer_count",
+}
+
+def attribute_setting_key(file_path, name):
+    if name == "Dimensions" and file_path.lower().endswith(('.mp4', '.mov')):
+        return "show_video_dimensions"
+    return ATTRIBUTE_SETTINGS.get(name)
+
+class AttributeWriter:
+    """Write-behind sink for attribute values.
+
+    Writes are queued per (path, name), so repeated values collapse into one, and are
+    flushed in batches through a single API handle. With 'skip_written_values' set,
+    values equal to what this machine wrote on a previous run (recorded in the metadata
+    index) are not written again. That record does not see edits made elsewhere in the
+    workspace, so the option is off by default."""
+
+    def __init__(self, workspace_id, settings, index=None, batch_size=250):
+        self.api = aps.get_api()
+        self.api.set_workspace(workspace_id)
+        self.workspace_id = workspace_id
+        self.index = index
+        self.skip_written = index is not None and settings.get("skip_written_values", False)
+        keys = set(ATTRIBUTE_SETTINGS.values()) | {"show_video_dimensions"}
+        self.enabled = {key: settings.get(key, True) for key in keys}
+        self.batch_size = batch_size
+        self.pending = {}
+        self.written = 0
+        self.unchanged = 0
+
+    def queue(self, file_path, attributes):
+        for name, value in attributes.items():
+            key = attribute_setting_key(file_path, name)
+            if not key or not self.enabled.get(key, True):
+                continue
+            self.pending[(file_path, name)] = value
+
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        pending, self.pending = self.pending, {}
+        for (file_path, name), value in pending.items():
+            if self.skip_written and self.index.written_value(self.workspace_id, file_path, name) == str(value):
+                self.unchanged += 1
+                continue
+
+            print(f"Setting {name} = {value}")
+            try:
+                self.api.attributes.set_attribute_value(file_path, name, value)
+                self.written += 1
+                if self.index:
+                    self.index.remember_written(self.workspace_id, file_path, name, value)
+            except Exception as e:
+                print(f"Failed to set {name} on {file_path}: {e}")
+
+def open_index(settings):
+    if not settings.get("use_index", True):
+        return None
+    try:
+        return MetadataIndex()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Metadata index unavailable, reading every file: {e}")
+        return None
+
+def discover_files(folders, recursive, exclude_patterns):
+    """Yield (path, stat_result) for supported files below folders as they are found.
+
+    Uses os.scandir so the stat info of each DirEntry is reused; directories and files
+    matching one of exclude_patterns are skipped."""
+    def excluded(name):
+        lowered = name.lower()
+        return any(fnmatch.fnmatch(lowered, pattern) for pattern in exclude_patterns)
+
+    pending = list(reversed(folders))
+    while pending:
+        folder = pending.pop()
+        subfolders = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if excluded(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                subfolders.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in SUPPORTED_SUFFIXES and entry.is_file():
+                            yield entry.path, entry.stat()
+                    except OSError as e:
+                        print(f"Could not read {entry.path}: {e}")
+        except OSError as e:
+            print(f"Could not scan folder {folder}: {e}")
+        pending.extend(reversed(subfolders))
+
+def parse_exclude_patterns(value):
+    return [pattern.strip().lower() for pattern in (value or "").split(",") if pattern.strip()]
 
 def run_with_progress():
     ctx = ap.get_context()
     ui = ap.UI()
     settings = aps.Settings()
 
-    supported_suffixes = [".png", ".jpg", ".jpeg", ".psd", ".psb", ".mp4", ".mov"]
-    selected_files = list(ctx.selected_files)
-
     recursive = settings.get("recursive", False)
-    for folder in ctx.selected_folders:
-        if recursive:
-            for root, dirs, files in os.walk(folder):
-                for entry in files:
-                    path = os.path.join(root, entry)
-                    if os.path.splitext(path)[1].lower() in supported_suffixes:
-                        selected_files.append(path)
-        else:
-            for entry in os.listdir(folder):
-                path = os.path.join(folder, entry)
-                if os.path.isfile(path) and os.path.splitext(path)[1].lower() in supported_suffixes:
-                    selected_files.append(path)
+    exclude_patterns = parse_exclude_patterns(settings.get("exclude_patterns", DEFAULT_EXCLUDE_PATTERNS))
+
+    def candidates():
+        for file in ctx.selected_files:
+            yield file, None
+        yield from discover_files(list(ctx.selected_folders), recursive, exclude_patterns)
 
-    total = len(selected_files)
     progress = ap.Progress("Extracting Metadata", infinite=False)
     progress.set_cancelable(True)
 
-    for idx, file in enumerate(selected_files):
-        if progress.canceled:
-            print("Operation canceled by user.")
-            break
-
-        suffix = os.path.splitext(file)[1].lower()
-        progress.set_text(f"Processing: {os.path.basename(file)}")
-        print(f"Processing {file}")
+    # Workers must not touch aps.Settings; give them a plain snapshot
+    options = {
+        "show_resolution": settings.get("show_resolution", True),
+        "video_timeout": get_video_timeout(settings),
+    }
+    workers = get_worker_count(settings)
+    max_in_flight = workers * 4
+    print(f"Extracting metadata with {workers} worker(s)")
+
+    index = open_index(settings)
+    variant = "resolution" if options["show_resolution"] else "no-resolution"
+
+    writer = AttributeWriter(ctx.workspace_id, settings, index)
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(file, stat_result):
+        fingerprint = MetadataIndex.fingerprint(file, stat_result)
+        cached = index.lookup(file, variant, fingerprint) if index else None
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return file, future, fingerprint, True
+        return file, executor.submit(extract_file_info, file, ctx.workspace_id, options), fingerprint, False
+
+    in_flight = deque()
+    discovered = 0
+    processed = 0
+    scanning = True
+    canceled = False
+
+    def report():
+        state = "Scanning" if scanning else "Processing"
+        progress.set_text(f"{state}: {processed} processed / {discovered} discovered")
+        progress.report_progress(processed / discovered if discovered else 0)
+
+    def finish_oldest():
+        # Results are consumed in discovery order so progress and attribute writes stay ordered
+        nonlocal processed, canceled
+        file, future, fingerprint, from_index = in_flight[0]
+        while True:
+            if progress.canceled:
+                print("Operation canceled by user.")
+                canceled = True
+                return
+            try:
+                attributes = future.result(timeout=0.2)
+                break
+            except FutureTimeoutError:
+                continue
+
+        in_flight.popleft()
+        if attributes is not None:
+            if index and not from_index:
+                index.store(file, variant, fingerprint, attributes)
+            writer.queue(file, attributes)
+        processed += 1
+        report()
 
-        if suffix in [".png", ".jpg", ".jpeg", ".psd", ".psb"]:
-            attributes = extract_image_info(file, ctx.workspace_id, settings)
-        elif suffix in [".mp4", ".mov"]:
-            attributes = extract_video_info(file)
-        else:
-            print(f"Unsupported file type: {suffix}")
-            progress.report_progress((idx + 1) / total)
-            continue
-
-        set_attributes(file, attributes, ctx, settings)
-        progress.report_progress((idx + 1) / total)
+    try:
+        for file, stat_result in candidates():
+            if progress.canceled:
+                canceled = True
+                break
+            in_flight.append(submit(file, stat_result))
+            discovered += 1
+            if discovered % 50 == 0:
+                report()
+            while len(in_flight) >= max_in_flight and not canceled:
+                finish_oldest()
+            if canceled:
+                break
+
+        scanning = False
+        while in_flight and not canceled:
+            finish_oldest()
+        print(f"Discovered {discovered} file(s), processed {processed}")
+        progress.set_text("Writing attributes")
+        writer.flush()
+        print(f"Attributes written: {writer.written}, unchanged: {writer.unchanged}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if index:
+            print(f"Metadata index: {index.hits} unchanged, {index.misses} read")
+            index.close()
 
     progress.finish()
     ui.show_success("Metadata extraction completed.")
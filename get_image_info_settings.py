@@ -1,6 +1,8 @@
 import anchorpoint as ap
 import apsync as aps
 
+from image_info_index import DEFAULT_EXCLUDE_PATTERNS, MetadataIndex
+
 ctx = ap.get_context()
 ui = ap.UI()
 settings = aps.Settings()
@@ -12,12 +14,32 @@ def store_settings(dialog: ap.Dialog):
     settings.set("show_frame_rate", dialog.get_value("show_frame_rate"))
     settings.set("show_bitrate", dialog.get_value("show_bitrate"))
     settings.set("show_duration", dialog.get_value("show_duration"))
+    try:
+        settings.set("video_timeout", max(1, int(dialog.get_value("video_timeout") or 30)))
+    except ValueError:
+        settings.set("video_timeout", 30)
     settings.set("show_layer_count", dialog.get_value("show_layer_count"))
     settings.set("recursive", dialog.get_value("recursive"))
+    settings.set("exclude_patterns", dialog.get_value("exclude_patterns"))
+    settings.set("use_index", dialog.get_value("use_index"))
+    settings.set("skip_written_values", dialog.get_value("skip_written_values"))
+    try:
+        settings.set("max_workers", max(0, int(dialog.get_value("max_workers") or 0)))
+    except ValueError:
+        settings.set("max_workers", 0)
     settings.store()
     dialog.close()
     ui.show_success("Settings saved")
 
+def clear_index(dialog: ap.Dialog):
+    try:
+        index = MetadataIndex()
+        index.clear()
+        index.close()
+        ui.show_success("Metadata index cleared")
+    except Exception as e:
+        ui.show_error("Could not clear metadata index", str(e))
+
 dialog = ap.Dialog()
 dialog.title = "Get Image Info Settings"
 
@@ -31,10 +53,20 @@ dialog.add_text("Show Dimensions").add_checkbox(default=settings.get("show_video
 dialog.add_text("Show Frame Rate").add_checkbox(default=settings.get("show_frame_rate", True), var="show_frame_rate")
 dialog.add_text("Show Bitrate").add_checkbox(default=settings.get("show_bitrate", True), var="show_bitrate")
 dialog.add_text("Show Duration").add_checkbox(default=settings.get("show_duration", True), var="show_duration")
+dialog.add_text("Timeout per Video (s)").add_input(str(int(settings.get("video_timeout", 30))), var="video_timeout", width=60)
 
 dialog.add_info("📂 Folder Processing")
 dialog.add_text("Recursive Scan").add_checkbox(default=settings.get("recursive", False), var="recursive")
+dialog.add_text("Skip Folders").add_input(settings.get("exclude_patterns", DEFAULT_EXCLUDE_PATTERNS), var="exclude_patterns")
+dialog.add_info("Comma separated names or wildcards, e.g. .git, *_cache")
+dialog.add_text("Parallel Files").add_input(str(settings.get("max_workers", 0)), var="max_workers", width=60)
+dialog.add_info("Number of files read at the same time. 0 picks a value based on the CPU.")
+dialog.add_text("Skip Unchanged Files").add_checkbox(default=settings.get("use_index", True), var="use_index")
+dialog.add_info("Reuses the values read last time for files whose size and date did not change.")
+dialog.add_text("Skip Values Written Before").add_checkbox(default=settings.get("skip_written_values", False), var="skip_written_values")
+dialog.add_info("Does not rewrite values this computer already set. Faster, but attributes changed or cleared by teammates are not restored.")
 
 dialog.add_button("Save", callback=store_settings)
+dialog.add_button("Clear Index", callback=clear_index)
 
 dialog.show()
\ No newline at end of file
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import time
+
+from user_dirs import user_data_dir
+
+# Local index of extracted metadata for Get Image Info. Files whose path, size and
+# mtime are unchanged since the last scan are served from here without decoding.
+
+INDEX_VERSION = 1
+COMMIT_EVERY = 500
+
+# Shared with the settings dialog, which cannot import get_image_info without running it
+DEFAULT_EXCLUDE_PATTERNS = ".git, .svn, .hg, __pycache__, .cache, *_cache, node_modules"
+
+def index_path():
+    return user_data_dir("get_image_info", "metadata_index.sqlite")
+
+class MetadataIndex:
+    """SQLite backed cache of extract_image_info/extract_video_info results.
+
+    Not thread-safe: use it from the thread that created it."""
+
+    def __init__(self, path=None):
+        self.path = path or index_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, variant TEXT, "
+            "attributes TEXT, updated REAL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS written ("
+            "workspace TEXT, path TEXT, name TEXT, value TEXT, PRIMARY KEY (workspace, path, name))"
+        )
+        self.conn.commit()
+        self.uncommitted = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(file_path, stat_result=None):
+        try:
+            st = stat_result or os.stat(file_path)
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def lookup(self, file_path, variant, fingerprint):
+        """Return the stored attributes if the file is unchanged, else None."""
+        if fingerprint is None:
+            return None
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, variant, attributes FROM files WHERE path = ?",
+            (self._key(file_path),),
+        ).fetchone()
+        if row and (row[0], row[1]) == fingerprint and row[2] == f"{INDEX_VERSION}:{variant}":
+            try:
+                attributes = json.loads(row[3])
+                self.hits += 1
+                return attributes
+            except ValueError:
+                pass
+        self.misses += 1
+        return None
+
+    def store(self, file_path, variant, fingerprint, attributes):
+        # Empty results mean extraction failed; keep those out so they are retried
+        if fingerprint is None or not attributes:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, variant, attributes, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self._key(file_path), fingerprint[0], fingerprint[1], f"{INDEX_VERSION}:{variant}",
+             json.dumps(attributes), time.time()),
+        )
+        self.uncommitted += 1
+        if self.uncommitted >= COMMIT_EVERY:
+            self.commit()
+
+    def written_value(self, workspace_id, file_path, name):
+        """Attribute value this action last wrote for the file, or None."""
+        row = self.conn.execute(
+            "SELECT value FROM written WHERE workspace = ? AND path = ? AND name = ?",
+            (workspace_id, self._key(file_path), name),
+        ).fetchone()
+        return row[0] if row else None
+
+    def remember_written(self, workspace_id, file_path, name, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO written (workspace, path, name, value) VALUES (?, ?, ?, ?)",
+            (workspace_id, self._key(file_path), name, str(value)),
+        )
+        self.uncommitted += 1
+        if self.uncommitted >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self.uncommitted = 0
+
+    def clear(self):
+        self.conn.execute("DELETE FROM files")
+        self.conn.execute("DELETE FROM written")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def close(self):
+        try:
+            self.commit()
+        finally:
+            self.conn.close()
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from user_dirs import user_cache_dir
+
+# On-disk LRU cache of generated PNGs shared by Save as PNG and Copy as PNG.
+# Entries are keyed by source path, size, mtime (optionally a content hash) and
+# the conversion parameters; a cache hit is a plain file copy.
+
+CONVERSION_PARAMS = "png;frame=0"
+DEFAULT_MAX_SIZE_MB = 2048
+
+def cache_root():
+    return user_cache_dir("png_cache")
+
+def file_content_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def copy_or_link(src, dst):
+    """Hard link when possible (same volume), otherwise copy."""
+    try:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+class ConversionCache:
+    def __init__(self, root=None, max_size_mb=DEFAULT_MAX_SIZE_MB, hash_contents=False, enabled=True):
+        self.root = root or cache_root()
+        self.entries_dir = os.path.join(self.root, "entries")
+        self.max_size = max(0, int(max_size_mb)) * 1024 * 1024
+        self.hash_contents = hash_contents
+        self.enabled = enabled and self.max_size > 0
+        if self.enabled:
+            try:
+                os.makedirs(self.entries_dir, exist_ok=True)
+            except OSError as e:
+                print(f"PNG cache disabled, cannot create {self.entries_dir}: {e}")
+                self.enabled = False
+
+    @classmethod
+    def from_settings(cls, settings):
+        try:
+            max_size_mb = int(settings.get("cache_size_mb", DEFAULT_MAX_SIZE_MB))
+        except (TypeError, ValueError):
+            max_size_mb = DEFAULT_MAX_SIZE_MB
+        return cls(
+            max_size_mb=max_size_mb,
+            hash_contents=bool(settings.get("cache_hash_contents", False)),
+            enabled=bool(settings.get("cache_enabled", True)),
+        )
+
+    def key(self, input_path, params=CONVERSION_PARAMS):
+        if not self.enabled:
+            return None
+        try:
+            st = os.stat(input_path)
+            parts = [os.path.normcase(os.path.abspath(input_path)), str(st.st_size), str(st.st_mtime_ns), params]
+            if self.hash_contents:
+                parts.append(file_content_hash(input_path))
+        except OSError:
+            return None
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.entries_dir, key + ".png")
+
+    def get(self, key):
+        """Return the cached PNG path for key, or None."""
+        if not key:
+            return None
+        path = self._entry_path(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, png_path):
+        if not key or not os.path.isfile(png_path):
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.entries_dir, suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(png_path, tmp_path)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            print(f"Could not store {png_path} in PNG cache: {e}")
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its size cap."""
+        if not self.enabled:
+            return
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.entries_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".png"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        shutil.rmtree(self.entries_dir, ignore_errors=True)
+        os.makedirs(self.entries_dir, exist_ok=True)
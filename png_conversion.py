@@ -0,0 +1,282 @@
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    from psd_tools import PSDImage
+except ImportError:
+    PSDImage = None
+
+# Shared conversion backend for Save as PNG, Copy as PNG and Get Image Info.
+# PSD/PSB/TGA/JPG are converted in-process from their embedded composite where
+# possible. Everything else is converted by a single magick process driven by a
+# -script file, so process startup and config/locale XML parsing are paid once
+# per batch.
+
+MAX_BATCH_SIZE = 32
+_MARKER = "@@png_conversion:"
+
+NATIVE_SUFFIXES = [".psd", ".psb", ".tga", ".jpg", ".jpeg", ".png"]
+_PNG_MODES = ["1", "L", "LA", "I", "I;16", "P", "RGB", "RGBA"]
+
+def find_magick():
+    action_root = os.path.dirname(__file__)
+    magick_path = os.path.join(action_root, "tools", "imagemagick", "magick.exe")
+    if os.path.exists(magick_path):
+        return magick_path
+    return shutil.which("magick")
+
+def default_worker_count(total, configured=0):
+    try:
+        configured = int(configured or 0)
+    except (TypeError, ValueError):
+        configured = 0
+    if configured <= 0:
+        # Leave one core for Anchorpoint itself
+        configured = max(1, (os.cpu_count() or 2) - 1)
+    return max(1, min(configured, total))
+
+def magick_env(workers):
+    # Each magick process is multi-threaded on its own; split the cores between them
+    env = os.environ.copy()
+    env["MAGICK_THREAD_LIMIT"] = str(max(1, (os.cpu_count() or 1) // max(1, workers)))
+    return env
+
+def _save_png(img, output_path):
+    if img.mode not in _PNG_MODES:
+        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    params = {}
+    if img.info.get("dpi"):
+        params["dpi"] = img.info["dpi"]
+    img.save(output_path, "PNG", **params)
+
+def convert_native(input_path, output_path):
+    """Convert in-process with Pillow/psd_tools. Returns False when ImageMagick is needed."""
+    suffix = os.path.splitext(input_path)[1].lower()
+    if Image is None or suffix not in NATIVE_SUFFIXES:
+        return False
+
+    psd = None
+    if suffix in (".psd", ".psb"):
+        # Without "Maximize Compatibility" the stored composite is blank, and Pillow
+        # would happily save it. Only use it when Photoshop marked it as real.
+        if PSDImage is None:
+            return False
+        try:
+            psd = PSDImage.open(input_path)
+            if not psd.has_preview():
+                return False
+        except Exception as e:
+            print(f"Native conversion failed for {input_path}: {e}")
+            return False
+
+    try:
+        if suffix != ".psb":
+            with Image.open(input_path) as img:
+                # For PSD, frame 0 is the merged composite Photoshop stores with the file
+                img.load()
+                _save_png(img, output_path)
+            return True
+    except Exception as e:
+        if suffix != ".psd":
+            print(f"Native conversion failed for {input_path}: {e}")
+            return False
+
+    # PSB (and PSD flavours Pillow cannot read): use the embedded composite via psd_tools
+    try:
+        img = psd.topil()
+        if img is None:
+            return False
+        _save_png(img, output_path)
+        return True
+    except Exception as e:
+        print(f"Native conversion failed for {input_path}: {e}")
+        return False
+
+class _ProcessGroup:
+    """Tracks running magick processes so they can all be killed on cancel."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes = set()
+        self.canceled = False
+
+    def popen(self, cmd, env=None):
+        startupinfo = None
+        if sys.platform.startswith("win"):
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        with self.lock:
+            if self.canceled:
+                return None
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                errors="replace", startupinfo=startupinfo, env=env,
+            )
+            self.processes.add(proc)
+        return proc
+
+    def release(self, proc):
+        with self.lock:
+            self.processes.discard(proc)
+
+    def kill_all(self):
+        with self.lock:
+            self.canceled = True
+            procs = list(self.processes)
+        for proc in procs:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    except OSError:
+        return None
+
+def _script_quote(path):
+    # magick-script tokens: forward slashes work on every platform and avoid escape handling
+    return "'" + path.replace("\\", "/") + "'"
+
+def _is_scriptable(path):
+    return "'" not in path and "\n" not in path
+
+def _run_single(magick_path, input_path, output_path, group, env):
+    proc = group.popen([magick_path, f"{input_path}[0]", output_path], env=env)
+    if proc is None:
+        return False, "canceled"
+    try:
+        out, _ = proc.communicate()
+    finally:
+        group.release(proc)
+    return proc.returncode == 0 and os.path.exists(output_path), (out or "").strip()
+
+def _run_batch(magick_path, jobs, group, env, emit):
+    """Convert jobs with one magick process. Calls emit(index, ok, error) per job.
+    Returns the indices that never got a result because the process died early."""
+    before = [_stat_key(output_path) for _, output_path in jobs]
+    fd, script_path = tempfile.mkstemp(prefix="png_conversion_", suffix=".mgk")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for i, (input_path, output_path) in enumerate(jobs):
+            f.write(f"-read {_script_quote(input_path + '[0]')} -write {_script_quote(output_path)} "
+                    f"-print '{_MARKER}{i}\\n' +delete\n")
+
+    proc = group.popen([magick_path, "-script", script_path], env=env)
+    if proc is None:
+        os.remove(script_path)
+        return []
+
+    reported = set()
+    errors = []
+    try:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line.startswith(_MARKER):
+                try:
+                    i = int(line[len(_MARKER):])
+                except ValueError:
+                    continue
+                output_path = jobs[i][1]
+                after = _stat_key(output_path)
+                ok = after is not None and after != before[i]
+                emit(i, ok, "\n".join(errors))
+                reported.add(i)
+                errors = []
+            elif line:
+                errors.append(line)
+        proc.wait()
+    finally:
+        group.release(proc)
+        try:
+            os.remove(script_path)
+        except OSError:
+            pass
+
+    return [i for i in range(len(jobs)) if i not in reported]
+
+def _convert_chunk(magick_path, jobs, group, env, results, native):
+    """Worker: converts a chunk in-process where possible, the rest in as few magick processes as possible."""
+    remaining = []
+    for input_path, output_path in jobs:
+        if group.canceled:
+            return
+        if native and convert_native(input_path, output_path):
+            results.put((input_path, output_path, True, ""))
+        elif not magick_path:
+            results.put((input_path, output_path, False, "ImageMagick (magick.exe) not found"))
+        elif _is_scriptable(input_path) and _is_scriptable(output_path):
+            remaining.append((input_path, output_path))
+        else:
+            ok, error = _run_single(magick_path, input_path, output_path, group, env)
+            results.put((input_path, output_path, ok, error))
+
+    while remaining and not group.canceled:
+        batch = remaining
+
+        def emit(i, ok, error):
+            results.put((batch[i][0], batch[i][1], ok, error))
+
+        missing = _run_batch(magick_path, batch, group, env, emit)
+        if len(missing) == len(batch):
+            # The batch made no progress at all; fall back to one process per file
+            for input_path, output_path in batch:
+                ok, error = _run_single(magick_path, input_path, output_path, group, env)
+                results.put((input_path, output_path, ok, error))
+            break
+        remaining = [batch[i] for i in missing]
+
+def convert_files(jobs, workers=1, canceled=None, native=True):
+    """Convert (input_path, output_path) jobs to PNG.
+
+    Generator yielding (input_path, output_path, ok, error) as files finish.
+    With native=False every file goes through ImageMagick. Stops when canceled() returns True; closing the generator early has the same
+    effect. Either way every running magick process is killed."""
+    jobs = list(jobs)
+    if not jobs:
+        return
+
+    magick_path = find_magick()
+    if not magick_path:
+        print("ERROR: ImageMagick (magick.exe) not found, only native conversions are available")
+
+    workers = default_worker_count(len(jobs), workers)
+    env = magick_env(workers)
+    chunk_size = max(1, min(MAX_BATCH_SIZE, -(-len(jobs) // workers)))
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    group = _ProcessGroup()
+    results = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(_convert_chunk, magick_path, chunk, group, env, results, native) for chunk in chunks]
+
+    reported = 0
+    try:
+        while reported < len(jobs):
+            if canceled and canceled():
+                return
+            try:
+                item = results.get(timeout=0.2)
+            except queue.Empty:
+                failed = [f for f in futures if f.done() and f.exception()]
+                if failed:
+                    raise failed[0].exception()
+                continue
+            reported += 1
+            yield item
+    finally:
+        if reported < len(jobs):
+            group.kill_all()
+        executor.shutdown(wait=True, cancel_futures=True)
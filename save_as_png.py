@@ -1,61 +1,164 @@
 import anchorpoint as ap
 import apsync as aps
+import json
 import os
-
-import subprocess, sys
-
-def run_hidden(cmd):
-    startupinfo = None
-    if sys.platform.startswith("win"):
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-    return subprocess.run(cmd, capture_output=True, text=True, startupinfo=startupinfo)
-
-
-def convert_with_imagemagick(input_path, output_path):
-    action_root = os.path.dirname(__file__)
-    magick_path = os.path.join(action_root, "tools", "imagemagick", "magick.exe")
-
-    if not os.path.exists(magick_path):
-        print(f"ERROR: magick.exe not found at {magick_path}")
-        return False
-
-    result = run_hidden([magick_path, f"{input_path}[0]", output_path])
-    if result.returncode != 0:
-        print("ImageMagick error:", result.stderr)
+import shutil
+import time
+
+import png_conversion
+from png_cache import ConversionCache, cache_root
+
+MANIFEST_MAX_ENTRIES = 50000
+PNG_SUBFOLDER = "_png"
+
+def manifest_path():
+    return os.path.join(cache_root(), "save_as_png_manifest.json")
+
+def load_manifest():
+    try:
+        with open(manifest_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def store_manifest(manifest):
+    if len(manifest) > MANIFEST_MAX_ENTRIES:
+        newest = sorted(manifest.items(), key=lambda item: item[1].get("updated", 0), reverse=True)
+        manifest = dict(newest[:MANIFEST_MAX_ENTRIES])
+    try:
+        os.makedirs(os.path.dirname(manifest_path()), exist_ok=True)
+        tmp_path = manifest_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path())
+    except OSError as e:
+        print(f"Could not write PNG manifest: {e}")
+
+def fingerprint(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def is_up_to_date(input_path, destination_path, manifest):
+    try:
+        source = fingerprint(input_path)
+        output = fingerprint(destination_path)
+    except OSError:
         return False
 
-    return True
+    entry = manifest.get(os.path.normcase(destination_path))
+    if entry:
+        # We wrote this PNG before: it is current if neither file changed since
+        return entry.get("source") == source and entry.get("output") == output
+    return output[1] >= source[1]
+
+def remember_output(input_path, destination_path, manifest):
+    try:
+        manifest[os.path.normcase(destination_path)] = {
+            "source": fingerprint(input_path),
+            "output": fingerprint(destination_path),
+            "updated": time.time(),
+        }
+    except OSError:
+        pass
+
+def destination_for(input_path, to_subfolder):
+    folder, name = os.path.split(input_path)
+    if to_subfolder:
+        folder = os.path.join(folder, PNG_SUBFOLDER)
+    return os.path.join(folder, os.path.splitext(name)[0] + ".png")
 
 def save_pngs(workspace_id, file_paths):
     progress = ap.Progress("Saving PNGs", infinite=False)
     progress.set_cancelable(True)
 
     ui = ap.UI()
+    settings = aps.Settings()
+    cache = ConversionCache.from_settings(aps.Settings("png_cache"))
     saved_paths = []
+    skipped_paths = []
+    incremental = settings.get("skip_unchanged", True)
+    to_subfolder = settings.get("save_to_subfolder", False)
+    manifest = load_manifest()
 
     total = len(file_paths)
-    for i, input_path in enumerate(file_paths):
-        if progress.canceled:
-            progress.finish()
-            ui.show_info("Process Canceled", "PNG saving was interrupted by the user.")
-            return
-
-        filename = os.path.basename(input_path)
-        progress.set_text(f"Processing {filename}")
-        print(f"Processing: {input_path}")
-
-        destination_path = os.path.splitext(input_path)[0] + ".png"
-        if convert_with_imagemagick(input_path, destination_path):
-            saved_paths.append(destination_path)
-            print(f"Saved PNG to: {destination_path}")
-
-        progress.report_progress((i + 1) / total)
-
-    progress.finish()
-
-    if saved_paths:
-        ui.show_success("PNG Saved", f"{len(saved_paths)} PNG(s) saved next to source file(s).")
+    done = 0
+
+    def report(input_path):
+        progress.set_text(f"Processed {os.path.basename(input_path)} ({done}/{total})")
+        progress.report_progress(done / total)
+
+    # Serve unchanged sources straight from the cache
+    jobs = []
+    cache_keys = {}
+    for input_path in file_paths:
+        # The manifest is keyed by destination, so '_png' outputs are tracked on their own
+        destination_path = destination_for(input_path, to_subfolder)
+        if incremental and is_up_to_date(input_path, destination_path, manifest):
+            skipped_paths.append(destination_path)
+            print(f"Skipped {input_path}: {os.path.basename(destination_path)} is up to date")
+            done += 1
+            report(input_path)
+            continue
+
+        if to_subfolder:
+            try:
+                os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            except OSError as e:
+                print(f"Could not create {os.path.dirname(destination_path)}: {e}")
+                done += 1
+                report(input_path)
+                continue
+
+        key = cache.key(input_path)
+        cached = cache.get(key)
+        if cached:
+            try:
+                shutil.copyfile(cached, destination_path)
+                saved_paths.append(destination_path)
+                remember_output(input_path, destination_path, manifest)
+                print(f"Saved PNG to: {destination_path} (cached)")
+                done += 1
+                report(input_path)
+                continue
+            except OSError as e:
+                print(f"Could not copy cached PNG for {input_path}: {e}")
+        cache_keys[input_path] = key
+        jobs.append((input_path, destination_path))
+
+    workers = png_conversion.default_worker_count(len(jobs), settings.get("max_workers", 0))
+    if jobs:
+        print(f"Converting {len(jobs)} file(s) with {workers} worker(s)")
+
+    # Closing the generator kills the magick processes and shuts the workers down, also on errors
+    conversions = png_conversion.convert_files(jobs, workers, lambda: progress.canceled)
+    try:
+        for input_path, destination_path, ok, error in conversions:
+            done += 1
+            if ok:
+                saved_paths.append(destination_path)
+                cache.put(cache_keys.get(input_path), destination_path)
+                remember_output(input_path, destination_path, manifest)
+                print(f"Saved PNG to: {destination_path}")
+            else:
+                print(f"ImageMagick error for {input_path}:", error)
+            report(input_path)
+    finally:
+        conversions.close()
+        cache.evict()
+        store_manifest(manifest)
+        canceled = progress.canceled
+        progress.finish()
+
+    if canceled:
+        ui.show_info("Process Canceled", "PNG saving was interrupted by the user.")
+        return
+
+    if saved_paths or skipped_paths:
+        where = f"to subfolder '{PNG_SUBFOLDER}'" if to_subfolder else "next to source file(s)"
+        message = f"{len(saved_paths)} PNG(s) saved {where}."
+        if skipped_paths:
+            message += f" {len(skipped_paths)} skipped (already up to date)."
+        ui.show_success("PNG Saved", message)
     else:
         ui.show_error("Error", "No PNGs were saved.")
 
@@ -1,17 +1,49 @@
 import anchorpoint as ap
 import apsync as aps
 
+from png_cache import ConversionCache, DEFAULT_MAX_SIZE_MB
+
 settings = aps.Settings()
+cache_settings = aps.Settings("png_cache")
 ui = ap.UI()
 
+def _int_value(dialog, var, default):
+    try:
+        return max(0, int(dialog.get_value(var) or default))
+    except ValueError:
+        return default
+
 def save_settings(dialog: ap.Dialog):
     settings.set("save_to_subfolder", dialog.get_value("save_to_subfolder"))
+    settings.set("max_workers", _int_value(dialog, "max_workers", 0))
+    settings.set("skip_unchanged", dialog.get_value("skip_unchanged"))
     settings.store()
+
+    cache_settings.set("cache_enabled", dialog.get_value("cache_enabled"))
+    cache_settings.set("cache_size_mb", _int_value(dialog, "cache_size_mb", DEFAULT_MAX_SIZE_MB))
+    cache_settings.set("cache_hash_contents", dialog.get_value("cache_hash_contents"))
+    cache_settings.store()
+
     dialog.close()
     ui.show_success("Settings saved")
 
+def clear_cache(dialog: ap.Dialog):
+    ConversionCache.from_settings(cache_settings).clear()
+    ui.show_success("PNG cache cleared")
+
 dialog = ap.Dialog()
 dialog.title = "Save as PNG Settings"
 dialog.add_text("Save to subfolder '_png'").add_checkbox(default=settings.get("save_to_subfolder", False), var="save_to_subfolder")
+dialog.add_text("Parallel conversions").add_input(str(settings.get("max_workers", 0)), var="max_workers", width=60)
+dialog.add_info("Number of files converted at the same time. 0 uses all CPU cores but one.")
+dialog.add_text("Skip up-to-date PNGs").add_checkbox(default=settings.get("skip_unchanged", True), var="skip_unchanged")
+
+dialog.add_info("PNG Cache (shared with Copy as PNG)")
+dialog.add_text("Reuse PNGs of unchanged files").add_checkbox(default=cache_settings.get("cache_enabled", True), var="cache_enabled")
+dialog.add_text("Cache size (MB)").add_input(str(cache_settings.get("cache_size_mb", DEFAULT_MAX_SIZE_MB)), var="cache_size_mb", width=80)
+dialog.add_text("Compare file contents").add_checkbox(default=cache_settings.get("cache_hash_contents", False), var="cache_hash_contents")
+dialog.add_info("Hashes every source file. Safer when tools keep modification times, but slower for large files.")
+
 dialog.add_button("Save", callback=save_settings)
+dialog.add_button("Clear Cache", callback=clear_cache)
 dialog.show()
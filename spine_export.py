@@ -2,18 +2,110 @@
 # Change vs _07: support selecting folders — scans for .spine files and batch-exports with default settings.
 # Change vs _07b: collect all selected folders from every available context attribute; ignore folders without .spine files.
 
-import os, re, json, shlex, platform, subprocess, tempfile, time, shutil
+from __future__ import annotations
+
+import os, re, csv, json, shlex, platform, subprocess, tempfile, time, shutil, threading, hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Optional, Tuple, Dict, List, Callable
 
-import anchorpoint as ap
-import apsync as aps
+import user_dirs
+
+try:
+    import anchorpoint as ap
+    import apsync as aps
+except ImportError:  # headless runs outside Anchorpoint, see spine_export_cli.py
+    ap = None
+    aps = None
 
 def dprint(msg: str):
     print(f"[Spine Export] {msg}", flush=True)
 
-ctx = ap.get_context()
-ui = ap.UI()
-settings = aps.Settings("spine_export")
+
+class HeadlessUI:
+    """Stands in for ap.UI outside Anchorpoint: notifications go to the log."""
+
+    def _show(self, kind: str, title: str, description: str = '', **kwargs):
+        dprint(f'{kind}: {title}' + (f' \u2014 {description}' if description else ''))
+
+    def show_info(self, title: str, description: str = '', **kwargs):
+        self._show('INFO', title, description)
+
+    def show_success(self, title: str, description: str = '', **kwargs):
+        self._show('OK', title, description)
+
+    def show_error(self, title: str, description: str = '', **kwargs):
+        self._show('ERROR', title, description)
+
+
+class HeadlessProgress:
+    """ap.Progress stand-in that logs its text, at most every interval seconds."""
+
+    def __init__(self, title: str, infinite: bool = False, cancel_event: Optional[threading.Event] = None, interval: float = 2.0):
+        self.title = title
+        self.cancel_event = cancel_event or threading.Event()
+        self.interval = interval
+        self.fraction: Optional[float] = None
+        self.last_print = 0.0
+        self.lock = threading.Lock()
+        dprint(f'{title}...')
+
+    @property
+    def canceled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def set_cancelable(self, cancelable: bool):
+        pass
+
+    def report_progress(self, fraction: float):
+        self.fraction = fraction
+
+    def set_text(self, text: str):
+        now = time.time()
+        with self.lock:
+            if now - self.last_print < self.interval:
+                return
+            self.last_print = now
+        pct = f'{self.fraction * 100:5.1f}%  ' if self.fraction is not None else ''
+        dprint(f'{pct}{text}')
+
+    def finish(self):
+        dprint(f'{self.title} finished')
+
+
+class HeadlessSettings:
+    """aps.Settings stand-in backed by an optional JSON file."""
+
+    def __init__(self, path: Optional[str] = None, values: Optional[dict] = None):
+        self.path = path
+        self.values: dict = {}
+        if path and os.path.isfile(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.values.update(json.load(f))
+        self.values.update(values or {})
+
+    def get(self, key: str, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key: str, value):
+        self.values[key] = value
+
+    def store(self):
+        if self.path:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.values, f, indent=2)
+
+
+def new_progress(title: str, infinite: bool = False):
+    """Progress sink used for every long-running step; replaceable for headless runs."""
+    if ap is not None:
+        return ap.Progress(title, infinite=infinite)
+    return HeadlessProgress(title, infinite)
+
+# Module-level sinks. Inside Anchorpoint these are the action context, toasts and the
+# shared settings; spine_export_cli.py swaps ui/settings/new_progress for console versions.
+ctx = ap.get_context() if ap is not None else None
+ui = ap.UI() if ap is not None else HeadlessUI()
+settings = aps.Settings("spine_export") if aps is not None else HeadlessSettings()
 
 DEFAULT_SPINE_WIN = "C:/Program Files/Spine/Spine.com"
 DEFAULT_SPINE_MAC = "/Applications/Spine.app/Contents/MacOS/Spine"
@@ -32,8 +124,37 @@ BATCH_DEFAULTS = dict(
     viewport_y=0,
     user_output_override='',
     chosen_skeletons=None,
+    profile='master',
 )
 
+# Encoder settings per export profile. Master is lossless PNG-in-MOV/AVI as before;
+# the others trade quality for smaller files and faster writes to network storage.
+EXPORT_PROFILES = {
+    'fast preview':        dict(encoding='JPEG', quality=60, compression=1),
+    'review':              dict(encoding='JPEG', quality=85, compression=3),
+    'master (fast write)': dict(encoding='PNG', quality=0, compression=1),
+    'master':              dict(encoding='PNG', quality=0, compression=6),
+}
+VIDEO_FORMATS = ('mov', 'avi')
+IMAGE_SEQUENCE_FORMATS = ('png', 'jpg')
+FORMAT_CHOICES = ['mov', 'avi', 'png sequence', 'jpg sequence']
+
+def export_profile(name: Optional[str]) -> dict:
+    return EXPORT_PROFILES.get(name or '', EXPORT_PROFILES[BATCH_DEFAULTS['profile']])
+
+def remembered_profile() -> str:
+    """Export profile picked last time, shown as the default in the export dialogs."""
+    name = settings.get('export_profile', BATCH_DEFAULTS['profile'])
+    return name if name in EXPORT_PROFILES else BATCH_DEFAULTS['profile']
+
+def remember_profile(name: str):
+    settings.set('export_profile', name)
+    settings.store()
+
+def format_from_choice(choice: Optional[str]) -> str:
+    """'png sequence' -> 'png'; video formats are returned unchanged."""
+    return (choice or 'mov').split()[0]
+
 def _subprocess_kwargs_hidden() -> dict:
     kw = dict(shell=False)
     if platform.system().lower().startswith('win'):
@@ -133,8 +254,12 @@ def _viewport_fields(width: int, height: int, use_fixed_viewport: bool, center_v
         crop_x = crop_y = crop_w = crop_h = 0
     return fit_width, fit_height, pad, enlarge, crop_x, crop_y, crop_w, crop_h
 
-def build_export_settings_json_dict(video_format: str, width: int, height: int, fps: float, background_choice: str, single_file: bool, use_fixed_viewport: bool, center_viewport: bool, viewport_x: int, viewport_y: int, skeleton_target: Optional[str]) -> dict:
-    clazz = 'export-mov' if video_format.lower() == 'mov' else 'export-avi'
+def build_export_settings_json_dict(video_format: str, width: int, height: int, fps: float, background_choice: str, single_file: bool, use_fixed_viewport: bool, center_viewport: bool, viewport_x: int, viewport_y: int, skeleton_target: Optional[str], profile: str = 'master') -> dict:
+    video_format = video_format.lower()
+    if video_format in IMAGE_SEQUENCE_FORMATS:
+        return build_sequence_export_settings_json_dict(video_format, width, height, fps, background_choice, use_fixed_viewport, center_viewport, viewport_x, viewport_y, skeleton_target, profile)
+    enc = export_profile(profile)
+    clazz = 'export-mov' if video_format == 'mov' else 'export-avi'
     output_type = 'singleFile' if single_file else 'filePerAnimation'
     bg = parse_bg_choice(background_choice)
     fit_width, fit_height, pad, enlarge, crop_x, crop_y, crop_w, crop_h = _viewport_fields(width, height, use_fixed_viewport, center_viewport, viewport_x, viewport_y)
@@ -170,15 +295,57 @@ def build_export_settings_json_dict(video_format: str, width: int, height: int,
         'outputType': output_type,
         'animationRepeat': 1,
         'animationPause': 0.0,
-        'encoding': 'PNG',
-        'quality': 0,
-        'compression': 6,
+        'encoding': enc['encoding'],
+        'quality': enc['quality'],
+        'compression': enc['compression'],
         'audio': False
     }
     if skeleton_target:
         settings_dict['skeleton'] = skeleton_target
     return settings_dict
 
+def build_sequence_export_settings_json_dict(image_format: str, width: int, height: int, fps: float, background_choice: str, use_fixed_viewport: bool, center_viewport: bool, viewport_x: int, viewport_y: int, skeleton_target: Optional[str], profile: str = 'master') -> dict:
+    """PNG/JPEG image sequence (one file per frame) with the encoder settings of profile."""
+    enc = export_profile(profile)
+    fit_width, fit_height, pad, enlarge, crop_x, crop_y, crop_w, crop_h = _viewport_fields(width, height, use_fixed_viewport, center_viewport, viewport_x, viewport_y)
+    settings_dict = {
+        'class': 'export-png' if image_format == 'png' else 'export-jpg',
+        'name': 'PNG' if image_format == 'png' else 'JPEG',
+        'open': False,
+        'exportType': 'animation',
+        'skeletonType': 'single' if skeleton_target else 'all',
+        'animationType': 'all',
+        'skinType': 'current',
+        'maxBounds': False,
+        'renderImages': True,
+        'renderBones': False,
+        'renderOthers': False,
+        'linearFiltering': True,
+        'scale': 100,
+        'fitWidth': fit_width,
+        'fitHeight': fit_height,
+        'enlarge': enlarge,
+        'pad': pad,
+        'background': parse_bg_choice(background_choice),
+        'fps': float(fps),
+        'lastFrame': False,
+        'cropX': crop_x,
+        'cropY': crop_y,
+        'cropWidth': crop_w,
+        'cropHeight': crop_h,
+        'rangeStart': -1,
+        'rangeEnd': -1,
+        'msaa': 0,
+        'packAtlas': None,
+    }
+    if image_format == 'png':
+        settings_dict['compression'] = enc['compression']
+    else:
+        settings_dict['quality'] = enc['quality'] if enc['encoding'] == 'JPEG' else 95
+    if skeleton_target:
+        settings_dict['skeleton'] = skeleton_target
+    return settings_dict
+
 def build_data_export_settings_json_dict() -> dict:
     return {'class': 'export-json', 'name': 'JSON', 'open': False, 'skeletonType': 'all', 'animationType': 'all', 'skinType': 'current'}
 
@@ -199,65 +366,408 @@ def _extract_skeleton_names_from_stdout(stdout: str) -> List[str]:
     return sorted(names)
 
 
-def probe_skeletons_sync(project_file: str, spine_exec: str) -> List[str]:
-    """Probe skeleton names from a .spine file synchronously. Returns [] on any failure."""
-    tmp_dir = tempfile.mkdtemp(prefix='spine_anim_probe_')
+ANALYSIS_TIMEOUT_SECS = 90
+ANALYSIS_FORMAT = 3  # bump when _run_project_analysis returns new keys, invalidates cached analyses
+ANALYSIS_CACHE_MAX_ENTRIES = 1000
+ANALYSIS_CACHE_MAX_AGE_DAYS = 60
+
+_analysis_lock = threading.Lock()
+_analysis_cache: Dict[str, dict] = {}
+
+def user_data_dir(*parts: str) -> str:
+    """Per-user data folder of this action (created on demand)."""
+    path = user_dirs.user_data_dir('spine_export', *parts)
+    ensure_dir(path)
+    return path
+
+def _file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _analysis_cache_key(project_file: str, spine_exec: str) -> Optional[str]:
+    """Fingerprint of a .spine file: path + size + mtime (+ content hash if enabled)."""
+    try:
+        st = os.stat(project_file)
+        parts = [os.path.normcase(os.path.abspath(project_file)), str(st.st_size), str(st.st_mtime_ns), spine_exec,
+                 str(settings.get('analysis_cache_generation', 0)), str(ANALYSIS_FORMAT)]
+        if settings.get('analysis_cache_hash', False):
+            parts.append(_file_sha1(project_file))
+    except OSError:
+        return None
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+def _load_cached_analysis(key: str) -> Optional[dict]:
+    path = os.path.join(user_data_dir('analysis_cache'), key + '.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        os.utime(path)  # mark as recently used
+        return data
+    except (OSError, ValueError):
+        return None
+
+def _store_cached_analysis(key: str, result: dict):
+    cache_dir = user_data_dir('analysis_cache')
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, os.path.join(cache_dir, key + '.json'))
+    except Exception as e:
+        dprint(f'Could not store project analysis: {e}')
+    _evict_cached_analyses(cache_dir)
+
+def _evict_cached_analyses(cache_dir: str):
+    cutoff = time.time() - ANALYSIS_CACHE_MAX_AGE_DAYS * 86400
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    try: entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError: pass
+    except OSError:
+        return
+    entries.sort(reverse=True)
+    for i, (mtime, path) in enumerate(entries):
+        if i >= ANALYSIS_CACHE_MAX_ENTRIES or mtime < cutoff:
+            try: os.remove(path)
+            except OSError: pass
+
+EXPORT_TIMEOUT_SECS = 120.0  # 2 minutes: if no output file appears, assume export never started
+EXPORT_TIMEOUT_MAX_SECS = 900.0
+TIMEOUT_HISTORY_FACTOR = 3.0  # allowance over the slowest recent run of the same job
+TIMEOUT_SECS_PER_MB = 2.0  # without history: extra allowance per MB of project input
+TIMEOUT_RETRIES = 2
+TIMEOUT_RETRY_BACKOFF_SECS = 15.0
+TIMEOUT_RETRY_GROWTH = 1.5
+TIMING_HISTORY_MAX_ENTRIES = 5000
+
+class TimingHistory:
+    """Durations of past Spine CLI runs per project, kept in the user data dir so timeouts
+    follow what each project actually needs instead of one fixed limit.
+
+    Entries are keyed by project and job ('analysis' or 'export:<skeleton>') and hold the
+    last duration and a slowly decaying maximum of the time until the first output file
+    appeared, both in seconds. Thread-safe."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(user_data_dir(), 'timing_history.json')
+        self.lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries: Dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def _key(proj: str, job: str) -> str:
+        return f'{os.path.normcase(os.path.abspath(proj))}|{job}'
+
+    def get(self, proj: str, job: str) -> dict:
+        with self.lock:
+            return dict(self.entries.get(self._key(proj, job)) or {})
+
+    def record(self, proj: str, job: str, duration: float, first_output: Optional[float] = None):
+        key = self._key(proj, job)
+        with self.lock:
+            entry = self.entries.get(key) or {}
+            if first_output is not None:
+                # One slow run on a busy share should not widen the timeout forever
+                entry['first_output'] = round(max(first_output, 0.75 * entry.get('first_output', 0.0)), 2)
+            entry['duration'] = round(duration, 2)
+            entry['time'] = time.time()
+            self.entries[key] = entry
+            if len(self.entries) > TIMING_HISTORY_MAX_ENTRIES:
+                newest = sorted(self.entries.items(), key=lambda kv: kv[1].get('time', 0), reverse=True)
+                self.entries = dict(newest[:TIMING_HISTORY_MAX_ENTRIES])
+            self._save()
+
+    def _save(self):
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            dprint(f'Could not write timing history: {e}')
+
+_timing_history: Optional[TimingHistory] = None
+_timing_history_lock = threading.Lock()
+
+def timing_history() -> TimingHistory:
+    global _timing_history
+    with _timing_history_lock:
+        if _timing_history is None:
+            _timing_history = TimingHistory()
+        return _timing_history
+
+def _project_input_bytes(project_file: str, analysis: Optional[dict] = None) -> int:
+    """Size of the .spine file plus the images folders found by the analysis."""
+    total = 0
+    try: total += os.path.getsize(project_file)
+    except OSError: pass
+    stack = [d for d in set(((analysis or {}).get('images') or {}).values()) if d]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False): stack.append(entry.path)
+                        elif entry.is_file(): total += entry.stat().st_size
+                    except OSError: pass
+        except OSError: pass
+    return total
+
+def adaptive_timeout(proj: str, job: str, floor_secs: float, input_bytes: Callable[[], int], key: str = 'first_output') -> float:
+    """Timeout for a CLI run: a multiple of the slowest recent run of the same job, or
+    floor_secs plus an allowance for the project size when there is no history yet.
+    Never below floor_secs, never above EXPORT_TIMEOUT_MAX_SECS."""
+    seen = timing_history().get(proj, job).get(key)
+    if seen:
+        secs = seen * TIMEOUT_HISTORY_FACTOR
+    else:
+        secs = floor_secs + _format_bytes_to_mb(input_bytes()) * TIMEOUT_SECS_PER_MB
+    return min(max(secs, floor_secs), max(floor_secs, EXPORT_TIMEOUT_MAX_SECS))
+
+def timeout_retries() -> int:
+    try:
+        return max(0, int(settings.get('timeout_retries', TIMEOUT_RETRIES)))
+    except (TypeError, ValueError):
+        return TIMEOUT_RETRIES
+
+def wait_before_retry(attempt: int, canceled: Callable[[], bool]) -> bool:
+    """Exponential backoff before retry number attempt (1-based). False if canceled meanwhile."""
+    end = time.time() + TIMEOUT_RETRY_BACKOFF_SECS * (2 ** (attempt - 1))
+    while not canceled():
+        left = end - time.time()
+        if left <= 0:
+            return True
+        time.sleep(min(0.25, left))
+    return False
+
+def _spine_version_from_output(cli_out: str) -> str:
+    m = re.search(r'Spine\s+v?(\d+\.\d+(?:\.\d+)*)', cli_out or '')
+    return m.group(1) if m else ''
+
+def _animation_duration(node) -> float:
+    """Latest key 'time' anywhere in an animation of the skeleton JSON, in seconds."""
+    if isinstance(node, dict):
+        latest = 0.0
+        t = node.get('time')
+        if isinstance(t, (int, float)):
+            latest = float(t)
+        for v in node.values():
+            if isinstance(v, (dict, list)):
+                latest = max(latest, _animation_duration(v))
+        return latest
+    if isinstance(node, list):
+        return max((_animation_duration(v) for v in node), default=0.0)
+    return 0.0
+
+def _resolve_images_dir(images, export_dir: str, project_dir: str) -> str:
+    """Absolute images folder of a skeleton from its exported 'images' path, or '' if unknown."""
+    if not isinstance(images, str) or not images.strip():
+        return ''
+    images = images.strip()
+    if os.path.isabs(images):
+        return os.path.normpath(images) if os.path.isdir(images) else ''
+    # Spine writes the path relative to the export location; older versions relative to the project
+    for base in (export_dir, project_dir):
+        cand = os.path.normpath(os.path.join(base, images))
+        if os.path.isdir(cand):
+            return cand
+    return ''
+
+def _run_cli_until_done(cmd: List[str], timeout_secs: float, canceled: Callable[[], bool]) -> Tuple[Optional[str], str]:
+    """Run a short Spine CLI job and return (output, '') or (None, 'timeout' / 'canceled').
+
+    The process is killed as soon as canceled() returns True or the timeout expires."""
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                         encoding='utf-8', errors='replace', **_subprocess_kwargs_hidden())
+    deadline = time.time() + timeout_secs
+    while True:
+        try:
+            out, _ = p.communicate(timeout=0.25)
+            return out or '', ''
+        except subprocess.TimeoutExpired:
+            if canceled():
+                reason = 'canceled'
+            elif time.time() > deadline:
+                reason = 'timeout'
+            else:
+                continue
+        try: p.terminate()
+        except Exception: pass
+        try: p.communicate(timeout=3)
+        except Exception:
+            try: p.kill(); p.communicate()
+            except Exception: pass
+        return None, reason
+
+def _run_project_analysis(project_file: str, spine_exec: str, canceled: Callable[[], bool] = lambda: False) -> dict:
+    result = {'ok': False, 'skeletons': [], 'animations': {}, 'images': {}, 'missing': [], 'cli_out': '', 'spine_version': ''}
+
+    tmp_dir = tempfile.mkdtemp(prefix='spine_analysis_')
     settings_path = write_temp_export_json(build_data_export_settings_json_dict())
     cmd = build_spine_command(spine_exec, project_file, tmp_dir, settings_path)
-    dprint('Probe cmd: ' + ' '.join(shlex.quote(p) for p in cmd))
+    dprint('Analysis cmd: ' + ' '.join(shlex.quote(p) for p in cmd))
 
-    out = ''
+    timeout_secs = adaptive_timeout(project_file, 'analysis', ANALYSIS_TIMEOUT_SECS,
+                                    lambda: _project_input_bytes(project_file), key='duration')
+    retries = timeout_retries()
     try:
-        kw = _subprocess_kwargs_hidden()
-        res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=90, **kw)
-        out = res.stdout or ''
-        dprint(out.strip())
-    except subprocess.TimeoutExpired as e:
-        dprint(f'probe_skeletons_sync timed out after 90s')
-        try: e.process.kill()
-        except Exception: pass
-        return []
+        for attempt in range(retries + 1):
+            if attempt:
+                if not wait_before_retry(attempt, canceled):
+                    break
+                timeout_secs = min(timeout_secs * TIMEOUT_RETRY_GROWTH, EXPORT_TIMEOUT_MAX_SECS)
+            started = time.time()
+            out, reason = _run_cli_until_done(cmd, timeout_secs, canceled)
+            if out is not None or reason == 'canceled':
+                break
+            dprint(f'Project analysis timed out after {timeout_secs:.0f}s (attempt {attempt + 1}/{retries + 1})')
+        if out is None:
+            if canceled():
+                dprint('Project analysis canceled')
+                result['cli_out'] = 'Project analysis canceled'
+            else:
+                result['cli_out'] = f'CLI timed out during project analysis ({retries + 1} attempt(s), last limit {timeout_secs:.0f}s)'
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return result
+        timing_history().record(project_file, 'analysis', time.time() - started)
+        result['cli_out'] = out
+        dprint(result['cli_out'].strip())
     except Exception as e:
-        dprint(f'probe_skeletons_sync failed: {e}')
-        return []
+        dprint(f'Project analysis failed: {e}')
+        result['cli_out'] = f'CLI error: {e}'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return result
     finally:
         try: os.remove(settings_path)
         except Exception: pass
 
-    json_files = [
-        os.path.join(tmp_dir, n) for n in os.listdir(tmp_dir)
-        if n.lower().endswith('.json') and os.path.join(tmp_dir, n) != settings_path
-    ]
-
     skeletons: List[str] = []
-    for jf in json_files:
+    for n in os.listdir(tmp_dir):
+        if not n.lower().endswith('.json'):
+            continue
+        jf = os.path.join(tmp_dir, n)
         try:
             with open(jf, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             meta = data.get('skeleton') or {}
             nm = meta.get('name')
-            name = nm.strip() if isinstance(nm, str) and nm.strip() else os.path.splitext(os.path.basename(jf))[0]
+            name = nm.strip() if isinstance(nm, str) and nm.strip() else os.path.splitext(n)[0]
             skeletons.append(name)
+            anims = data.get('animations') or {}
+            result['animations'][name] = {a: _animation_duration(v) for a, v in anims.items()}
+            result['images'][name] = _resolve_images_dir(meta.get('images'), tmp_dir, os.path.dirname(project_file))
         except Exception as e:
             dprint(f'Failed to parse {jf}: {e}')
 
-    if not skeletons:
-        skeletons = _extract_skeleton_names_from_stdout(out)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
 
-    try:
-        import shutil; shutil.rmtree(tmp_dir, ignore_errors=True)
-    except Exception:
-        pass
+    if not skeletons:
+        skeletons = _extract_skeleton_names_from_stdout(result['cli_out'])
 
     unique, seen = [], set()
-    for s in skeletons:
-        if s not in seen:
-            seen.add(s); unique.append(s)
-    return unique
+    for sk in skeletons:
+        if sk not in seen:
+            seen.add(sk); unique.append(sk)
+    result['skeletons'] = unique
+
+    # Detect lines that match Spine's missing-image format:
+    # "Image for attachment [...] not found: <name>"
+    result['missing'] = [
+        line.strip()
+        for line in result['cli_out'].splitlines()
+        if 'Image for attachment' in line and 'not found' in line
+    ]
+    result['spine_version'] = _spine_version_from_output(result['cli_out'])
+    result['ok'] = True
+    return result
+
+def _images_fingerprint(project_file: str, analysis: dict) -> str:
+    """Names, sizes and mtimes of the analysed images folders (or of the project folder
+    when those are unknown): the missing-image list is only valid while these match."""
+    h = hashlib.sha1()
+    image_dirs = sorted({d for d in (analysis.get('images') or {}).values() if d})
+    if image_dirs:
+        for d in image_dirs:
+            h.update(f'images:{os.path.normcase(d)}'.encode('utf-8'))
+            _hash_tree(h, d)
+    else:
+        _hash_tree(h, os.path.dirname(os.path.abspath(project_file)), skip_outputs=True)
+    return h.hexdigest()
+
+def analyze_project(project_file: str, spine_exec: str, key_path: Optional[str] = None,
+                    canceled: Callable[[], bool] = lambda: False,
+                    images_fingerprint: Optional[str] = None) -> dict:
+    """Run the JSON data export once per project and return everything derived from it.
+
+    Returns a dict with keys:
+      'ok'         – False if the CLI could not be run or timed out
+      'skeletons'  – skeleton names (unique, in export order)
+      'animations' – {skeleton: {animation: duration in seconds}}
+      'images'     – {skeleton: absolute images folder, '' if unknown}
+      'missing'    – raw missing-image error lines
+      'cli_out'    – full CLI output of the JSON export
+      'spine_version' – Spine version reported by the CLI, if any
+      'images_fingerprint' – state of the images folders when the result was cached
+    Successful results are cached in memory and on disk in the user data dir, keyed by
+    the fingerprint of key_path (defaults to project_file), so the skeleton picker, the
+    auto-probe and the trace writer share a single Spine CLI run, also across runs.
+    Pass the original project as key_path when analyzing an identical local copy.
+    A cached result is only reused while its images folders are unchanged; pass the
+    images_fingerprint already taken in this run to avoid walking them again. The CLI run
+    (including timeout retries and their backoff) stops as soon as canceled() is True."""
+    key_file = key_path or project_file
+    key = _analysis_cache_key(key_file, spine_exec)
+    if key:
+        with _analysis_lock:
+            cached = _analysis_cache.get(key)
+        if not cached:
+            cached = _load_cached_analysis(key)
+            if cached:
+                with _analysis_lock:
+                    _analysis_cache[key] = cached
+        if cached and not images_fingerprint:
+            images_fingerprint = _images_fingerprint(key_file, cached)
+        if cached and cached.get('images_fingerprint') != images_fingerprint:
+            dprint(f'Images of {os.path.basename(project_file)} changed since its last analysis')
+            cached = None
+        if cached:
+            dprint(f'Reusing project analysis of {os.path.basename(project_file)}')
+            return cached
+
+    result = _run_project_analysis(project_file, spine_exec, canceled)
+    if result['ok'] and key:
+        result['images_fingerprint'] = images_fingerprint or _images_fingerprint(key_file, result)
+        with _analysis_lock:
+            _analysis_cache[key] = result
+        _store_cached_analysis(key, result)
+    return result
+
+def probe_skeletons_sync(project_file: str, spine_exec: str, key_path: Optional[str] = None) -> List[str]:
+    """Probe skeleton names from a .spine file synchronously. Returns [] on any failure."""
+    return analyze_project(project_file, spine_exec, key_path)['skeletons']
+
+def animation_frames(analysis: dict, skeleton: Optional[str], fps: float) -> Dict[str, int]:
+    """Frames each animation renders at fps for one skeleton (None: every skeleton of the project)."""
+    per_skeleton = analysis.get('animations') or {}
+    sources = [per_skeleton.get(skeleton) or {}] if skeleton else list(per_skeleton.values())
+    frames: Dict[str, int] = {}
+    for anims in sources:
+        for name, duration in anims.items():
+            frames[name] = frames.get(name, 0) + max(1, int(-(-float(duration) * float(fps) // 1)))
+    return frames
 
 
 def probe_skeletons_async(project_file: str, on_done: Callable[[List[str]], None]):
-    progress = ap.Progress('Extracting Skeletons...', infinite=True)
+    progress = new_progress('Extracting Skeletons...', infinite=True)
     progress.set_cancelable(False)
     progress.set_text('Reading project and extracting skeleton list...')
 
@@ -277,33 +787,201 @@ def _format_bytes_to_mb(size_bytes: int) -> float:
     except Exception:
         return 0.0
 
-def _scan_for_active_sidefile(folder: str) -> Optional[str]:
-    exts = ['.mov', '.avi', '.tmp', '.part', '.partial', '.mp4', '.m4v']
+SIDEFILE_EXTS = ('.mov', '.avi', '.tmp', '.part', '.partial', '.mp4', '.m4v', '.png', '.jpg')
+
+def _scan_for_active_sidefile(folder: str, min_mtime: float = 0.0, prefix: str = '') -> Optional[str]:
+    """Newest export output in folder whose name starts with prefix (case-insensitive),
+    reusing the stat info of each directory entry."""
+    newest, newest_t = None, -1.0
+    prefix = prefix.lower()
     try:
-        names = os.listdir(folder)
-    except Exception:
-        names = []
-    newest, newest_t = None, -1
-    for n in names:
-        if not any(n.lower().endswith(e) for e in exts):
-            continue
-        full = os.path.join(folder, n)
-        try:
-            t = os.path.getmtime(full)
-        except Exception:
-            continue
-        if t > newest_t:
-            newest, newest_t = full, t
+        with os.scandir(folder) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if not name.endswith(SIDEFILE_EXTS) or not name.startswith(prefix):
+                    continue
+                try:
+                    t = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if t >= min_mtime and t > newest_t:
+                    newest, newest_t = entry.path, t
+    except OSError:
+        pass
     return newest
 
-def _probe_current_output(target_path: str) -> Optional[str]:
-    if not target_path: return None
-    if looks_like_file(target_path):
-        if os.path.isfile(target_path): return target_path
-        parent = os.path.dirname(target_path) or os.getcwd()
-        return _scan_for_active_sidefile(parent)
-    else:
-        return _scan_for_active_sidefile(target_path)
+
+class OutputTracker:
+    """Finds the file the Spine CLI is writing and locks onto it.
+
+    The output folder is only rescanned until a file is found, or when the locked file
+    stops growing (file-per-animation exports move on to the next file). Parallel jobs
+    can share a folder, so a file target only matches its own name and temp files
+    derived from it ('<name>.mov', '<name>.mov.part', '<name>.tmp'); a folder target is
+    the job's own output folder."""
+
+    def __init__(self, target_path: str, start_time: float):
+        self.target_path = target_path
+        self.is_file = looks_like_file(target_path)
+        self.folder = (os.path.dirname(target_path) if self.is_file else target_path) or os.getcwd()
+        self.prefix = os.path.splitext(os.path.basename(target_path))[0] + '.' if self.is_file else ''
+        self.min_mtime = start_time - 2.0  # tolerate coarse filesystem timestamps
+        self.active_path: Optional[str] = None
+
+    def _rescan(self):
+        if self.is_file and os.path.isfile(self.target_path):
+            self.active_path = self.target_path
+        else:
+            self.active_path = _scan_for_active_sidefile(self.folder, self.min_mtime, self.prefix)
+
+    def size_bytes(self) -> Optional[int]:
+        for _ in range(2):
+            if not self.active_path:
+                self._rescan()
+                if not self.active_path:
+                    return None
+            try:
+                return os.path.getsize(self.active_path)
+            except OSError:
+                self.active_path = None
+        return None
+
+    def on_stagnant(self) -> bool:
+        """Look for a newer output file; returns True if the tracker switched files."""
+        previous = self.active_path
+        cand = _scan_for_active_sidefile(self.folder, self.min_mtime, self.prefix)
+        if cand and cand != previous:
+            self.active_path = cand
+            return True
+        return False
+
+
+class CliOutputPump(threading.Thread):
+    """Copies Spine CLI stdout into the log file line by line and fires pattern hooks.
+
+    hooks maps a lower-case substring to a callback receiving the matching line. The
+    wake event is set whenever a hook fires and when the CLI closes its output."""
+
+    def __init__(self, stream, logf, hooks: Dict[str, Callable[[str], None]], wake: threading.Event):
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.logf = logf
+        self.hooks = hooks
+        self.wake = wake
+
+    def run(self):
+        try:
+            for line in iter(self.stream.readline, ''):
+                try:
+                    self.logf.write(line)
+                except Exception:
+                    pass
+                lowered = line.lower()
+                for pattern, hook in self.hooks.items():
+                    if pattern in lowered:
+                        try:
+                            hook(line)
+                        except Exception as e:
+                            dprint(f'CLI output hook failed: {e}')
+                        self.wake.set()
+        except Exception as e:
+            dprint(f'CLI output pump stopped: {e}')
+        finally:
+            self.wake.set()
+
+class FrameProgress:
+    """Estimates how many frames of a video export the Spine CLI has rendered.
+
+    Built from the frame count of every animation in the job. Animation names and
+    'frame N/M' counters in the CLI output, and new output files of file-per-animation
+    exports, tell which animation is being rendered; in between, the current animation is
+    interpolated with the seconds per frame measured on the finished ones."""
+
+    FRAME_RE = re.compile(r'\bframe\s*:?\s*(\d+)\s*(?:/|of)\s*(\d+)', re.IGNORECASE)
+    PERCENT_RE = re.compile(r'(\d{1,3}(?:\.\d+)?)\s*%')
+
+    def __init__(self, frames: Dict[str, int]):
+        self.frames = {n: max(1, int(f)) for n, f in frames.items()}
+        self.total_frames = sum(self.frames.values())
+        # Longest names first so 'walk_fast' wins over 'walk'
+        self.patterns = [(n, re.compile(r'(?<![\w-])' + re.escape(n) + r'(?![\w-])', re.IGNORECASE))
+                         for n in sorted(self.frames, key=len, reverse=True)]
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.done: set = set()
+        self.done_frames = 0
+        self.done_secs = 0.0
+        self.current: Optional[str] = None
+        self.current_start = self.start_time
+        self.current_frames: Optional[float] = None  # reported by the CLI, if it does
+
+    def _match(self, text: str) -> Optional[str]:
+        for name, pattern in self.patterns:
+            if pattern.search(text):
+                return name
+        return None
+
+    def _start(self, name: str):
+        if name == self.current or name in self.done:
+            return
+        now = time.time()
+        if self.current:
+            self.done.add(self.current)
+            self.done_frames += self.frames[self.current]
+            self.done_secs += now - self.current_start
+        self.current, self.current_start, self.current_frames = name, now, None
+
+    def on_line(self, line: str):
+        with self.lock:
+            name = self._match(line)
+            if name:
+                self._start(name)
+            if not self.current:
+                return
+            m = self.FRAME_RE.search(line)
+            if m:
+                self.current_frames = float(m.group(1))
+                return
+            m = self.PERCENT_RE.search(line)
+            if m:
+                self.current_frames = self.frames[self.current] * min(100.0, float(m.group(1))) / 100.0
+
+    def on_output_file(self, path: str):
+        with self.lock:
+            # Image sequences number their frames: 'walk_00012.png'
+            stem = re.sub(r'[_\-. ]*\d+$', '', os.path.splitext(os.path.basename(path))[0])
+            name = self._match(stem)
+            if name:
+                self._start(name)
+
+    def fraction(self) -> Optional[float]:
+        """Share of the job's frames rendered so far, or None while there is nothing to go by."""
+        with self.lock:
+            if not self.current:
+                return None
+            cur_total = self.frames[self.current]
+            cur = self.current_frames
+            if cur is None and self.done_frames and self.done_secs > 0:
+                cur = (time.time() - self.current_start) * self.done_frames / self.done_secs
+            cur = min(cur or 0.0, cur_total * 0.99)
+            return min(1.0, (self.done_frames + cur) / float(self.total_frames))
+
+    def eta_secs(self) -> Optional[float]:
+        frac = self.fraction()
+        if not frac or frac < 0.01:
+            return None
+        elapsed = time.time() - self.start_time
+        return elapsed * (1.0 - frac) / frac
+
+
+def format_eta(secs: Optional[float]) -> str:
+    if secs is None:
+        return '\u2014'
+    secs = int(round(secs))
+    h, rem = divmod(secs, 3600)
+    m, sec = divmod(rem, 60)
+    return f'{h}:{m:02d}:{sec:02d}' if h else f'{m}:{sec:02d}'
+
 
 def _human_rate(delta_mb: float, dt: float) -> str:
     if dt <= 0: return '0 MB/s'
@@ -334,15 +1012,20 @@ def show_open_log_prompt(log_path: str):
     d.add_button("Close", callback=lambda dlg: dlg.close())
     d.show()
 
-EXPORT_TIMEOUT_SECS = 120.0  # 2 minutes: if no output file appears, assume export never started
-
 def run_spine_cli_with_progress(
     spine_exec: str, project_file: str, output_target: str, export_json: str,
     progress: ap.Progress, poll_secs: float = 0.5, repaint_nudge: float = None,
     timeout_secs: float = EXPORT_TIMEOUT_SECS, progress_prefix: str = '',
+    frame_progress: Optional[FrameProgress] = None, progress_range: Tuple[float, float] = (0.0, 1.0),
+    stats: Optional[dict] = None,
 ) -> Tuple[bool, str]:
     """Run Spine CLI and monitor progress.
 
+    With frame_progress, the CLI output drives a real percentage and ETA, reported to
+    progress mapped into progress_range; otherwise only size and write speed are shown.
+    A stats dict receives 'first_output' (seconds until the output file appeared, if it
+    did), 'elapsed' and 'bytes' (size of the output files seen while polling).
+
     Returns:
       (True,  '')                    — success
       (False, log_path)              — CLI exited non-zero; log kept at log_path
@@ -371,7 +1054,8 @@ def run_spine_cli_with_progress(
 
     try:
         kw = _subprocess_kwargs_hidden()
-        p = subprocess.Popen(command, stdout=logf, stderr=logf, text=True, **kw)
+        p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                             encoding='utf-8', errors='replace', bufsize=1, **kw)
     except FileNotFoundError:
         logf.close(); ui.show_error('Failed to start Spine CLI', description=spine_exec); return False, ''
 
@@ -379,8 +1063,21 @@ def run_spine_cli_with_progress(
     last_probe_t = start_time
     last_size_mb = -1.0
     stagnant_checks = 0
-    active_path: Optional[str] = None
     special_result: Optional[str] = None
+    tracker = OutputTracker(output_target, start_time)
+    written: Dict[str, int] = {}  # output file -> last polled size
+    wake = threading.Event()
+
+    def _on_img_path_not_found(line: str):
+        nonlocal special_result
+        dprint('Detected "images path not found" in CLI output — killing process')
+        special_result = 'img_path_not_found'
+
+    hooks: Dict[str, Callable[[str], None]] = {'images path not found': _on_img_path_not_found}
+    if frame_progress is not None:
+        hooks[''] = frame_progress.on_line  # every line
+    pump = CliOutputPump(p.stdout, logf, hooks, wake)
+    pump.start()
 
     def _kill_proc():
         try: p.terminate()
@@ -394,77 +1091,76 @@ def run_spine_cli_with_progress(
         while True:
             if progress.canceled:
                 _kill_proc()
-                ui.show_info('Canceled', 'The export has been canceled by the user.')
                 return False, 'canceled'
 
-            now = time.time()
-            if now - last_probe_t >= poll_secs:
-                # --- Live log check: images path not found ---
-                try:
-                    with open(log_path, 'r', encoding='utf-8', errors='replace') as lf:
-                        log_so_far = lf.read()
-                    if 'images path not found' in log_so_far.lower():
-                        dprint('Detected "images path not found" in live CLI log — killing process')
-                        special_result = 'img_path_not_found'
-                except Exception:
-                    pass
+            # Blocks until the next probe is due, a pattern hook fires or the CLI exits
+            wake.wait(timeout=max(0.0, last_probe_t + poll_secs - time.time()))
+            wake.clear()
 
-                if special_result:
-                    _kill_proc()
-                    break
+            if special_result:
+                _kill_proc()
+                break
+            if p.poll() is not None:
+                break
 
-                # --- Probe output file for size/speed ---
-                if not active_path:
-                    active_path = _probe_current_output(output_target)
-                if not active_path or (active_path and not os.path.exists(active_path)):
-                    folder = os.path.dirname(output_target) if looks_like_file(output_target) else output_target
-                    active_path = _scan_for_active_sidefile(folder or os.getcwd())
-
-                size_mb = None
-                if active_path and os.path.exists(active_path):
-                    try: size_mb = _format_bytes_to_mb(os.path.getsize(active_path))
-                    except Exception: size_mb = None
-
-                if size_mb is not None:
-                    dt = now - last_probe_t
-                    delta_mb = 0.0 if last_size_mb < 0 else (size_mb - last_size_mb)
-                    speed_txt = _human_rate(delta_mb, dt)
-                    progress.set_text(f'{progress_prefix}Size: {size_mb:.2f} MB  \u2022  Write speed: {speed_txt}')
-                    if repaint_nudge is not None: progress.report_progress(repaint_nudge)
-                    if last_size_mb >= 0 and size_mb <= last_size_mb + 1e-6: stagnant_checks += 1
-                    else: stagnant_checks = 0
-                    last_size_mb = size_mb
-                else:
-                    progress.set_text(f'{progress_prefix}Size: \u2014  \u2022  Write speed: \u2014')
-                    if repaint_nudge is not None: progress.report_progress(repaint_nudge)
-
-                if stagnant_checks >= 3:
-                    folder = os.path.dirname(output_target) if looks_like_file(output_target) else output_target
-                    new_cand = _scan_for_active_sidefile(folder or os.getcwd())
-                    if new_cand and new_cand != active_path:
-                        active_path = new_cand; stagnant_checks = 0
-
-                # --- Timeout: no output file has ever appeared ---
-                elapsed = now - start_time
-                if elapsed > timeout_secs and last_size_mb < 0:
-                    dprint(f'Export timeout after {elapsed:.0f}s with no output file — killing process')
-                    special_result = 'timeout'
-                    _kill_proc()
-                    break
+            now = time.time()
+            if now - last_probe_t < poll_secs:
+                continue
 
-                last_probe_t = now
+            # --- Probe output file for size/speed ---
+            size_bytes = tracker.size_bytes()
+            size_mb = _format_bytes_to_mb(size_bytes) if size_bytes is not None else None
+            if frame_progress is not None and tracker.active_path:
+                frame_progress.on_output_file(tracker.active_path)
+            frac = frame_progress.fraction() if frame_progress is not None else None
+            frame_txt = f'{frac * 100:.0f}%  \u2022  ETA {format_eta(frame_progress.eta_secs())}  \u2022  ' if frac is not None else ''
+
+            if size_mb is not None:
+                if stats is not None and 'first_output' not in stats:
+                    stats['first_output'] = now - start_time
+                written[tracker.active_path] = size_bytes
+                dt = now - last_probe_t
+                delta_mb = 0.0 if last_size_mb < 0 else (size_mb - last_size_mb)
+                speed_txt = _human_rate(delta_mb, dt)
+                progress.set_text(f'{progress_prefix}{frame_txt}Size: {size_mb:.2f} MB  \u2022  Write speed: {speed_txt}')
+                if last_size_mb >= 0 and size_mb <= last_size_mb + 1e-6: stagnant_checks += 1
+                else: stagnant_checks = 0
+                last_size_mb = size_mb
+            else:
+                progress.set_text(f'{progress_prefix}{frame_txt}Size: \u2014  \u2022  Write speed: \u2014')
+            if frac is not None:
+                lo, hi = progress_range
+                progress.report_progress(lo + (hi - lo) * frac)
+            elif repaint_nudge is not None:
+                progress.report_progress(repaint_nudge)
+
+            if stagnant_checks >= 3 and tracker.on_stagnant():
+                stagnant_checks = 0
+
+            # --- Timeout: no output file has ever appeared ---
+            elapsed = now - start_time
+            if elapsed > timeout_secs and last_size_mb < 0:
+                dprint(f'Export timeout after {elapsed:.0f}s with no output file — killing process')
+                special_result = 'timeout'
+                _kill_proc()
+                break
 
-            ret = p.poll()
-            if ret is not None: break
-            time.sleep(0.05)
+            last_probe_t = now
 
     finally:
         try:
             if p and p.poll() is None: p.wait(timeout=0.5)
         except Exception: pass
+        pump.join(timeout=2)
         try:
             logf.flush(); logf.close()
         except Exception: pass
+        if stats is not None:
+            stats['elapsed'] = time.time() - start_time
+            for path in written:
+                try: written[path] = os.path.getsize(path)
+                except OSError: pass
+            stats['bytes'] = sum(written.values())
 
     if special_result:
         # Return log path alongside sentinel so caller can write a trace
@@ -492,8 +1188,10 @@ def run_spine_cli_with_progress(
 
     return True, ''
 
-def check_missing_images_in_project(project_file: str, spine_exec: str) -> dict:
-    """Run a JSON export and scan the CLI output for missing-image error lines.
+def check_missing_images_in_project(project_file: str, spine_exec: str, key_path: Optional[str] = None,
+                                    canceled: Callable[[], bool] = lambda: False,
+                                    images_fingerprint: Optional[str] = None) -> dict:
+    """Scan the project analysis for missing-image error lines.
     Spine reports missing images as lines containing both
     'Image for attachment' and 'not found'.
 
@@ -501,49 +1199,12 @@ def check_missing_images_in_project(project_file: str, spine_exec: str) -> dict:
       'missing'  – list of raw error lines (one per missing image)
       'cli_out'  – full CLI output from the JSON export run
     """
-    import shutil
-
-    result = {'missing': [], 'cli_out': ''}
-
-    tmp_dir = tempfile.mkdtemp(prefix='spine_missing_chk_')
-    settings_path = write_temp_export_json(build_data_export_settings_json_dict())
-    cmd = build_spine_command(spine_exec, project_file, tmp_dir, settings_path)
-    dprint('Missing-image check cmd: ' + ' '.join(shlex.quote(p) for p in cmd))
-
-    try:
-        kw = _subprocess_kwargs_hidden()
-        res = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=90, **kw)
-        result['cli_out'] = res.stdout or ''
-        dprint(result['cli_out'].strip())
-    except subprocess.TimeoutExpired as e:
-        dprint('check_missing_images: CLI timed out after 90s')
-        try: e.process.kill()
-        except Exception: pass
-        result['cli_out'] = 'CLI timed out during missing image check'
-        return result
-    except Exception as e:
-        dprint(f'check_missing_images: CLI failed: {e}')
-        result['cli_out'] = f'CLI error: {e}'
-        return result
-    finally:
-        try: os.remove(settings_path)
-        except Exception: pass
-
-    try: shutil.rmtree(tmp_dir, ignore_errors=True)
-    except Exception: pass
-
-    # Detect lines that match Spine's missing-image format:
-    # "Image for attachment [...] not found: <name>"
-    missing_lines = [
-        line.strip()
-        for line in result['cli_out'].splitlines()
-        if 'Image for attachment' in line and 'not found' in line
-    ]
-    result['missing'] = missing_lines
+    analysis = analyze_project(project_file, spine_exec, key_path, canceled, images_fingerprint)
+    result = {'missing': list(analysis['missing']), 'cli_out': analysis['cli_out']}
 
-    if missing_lines:
-        dprint(f'Missing images detected ({len(missing_lines)}):')
-        for ln in missing_lines:
+    if result['missing']:
+        dprint(f'Missing images detected ({len(result["missing"])}):')
+        for ln in result['missing']:
             dprint(f'  {ln}')
     else:
         dprint('No missing image lines found in CLI output')
@@ -588,7 +1249,7 @@ _PREVIEW_TAGS = [
     ('No Anim',            aps.TagColor.blue),
     ('Export Not Started', aps.TagColor.purple),
     ('IMG Path Not Found', aps.TagColor.orange),
-]
+] if aps is not None else []
 
 def ensure_preview_status_attribute(api):
     """Get (or create) the 'Preview Status' single-choice-tag attribute, adding any missing tags.
@@ -664,257 +1325,1255 @@ def _write_status_trace(trace_path: str, project_file: str, status: str, detail:
         dprint(f'Failed to write status trace: {e}')
 
 
-def export_worker(selected_files: List[str], width: int, height: int, fps: float, bg: str, single_file: bool, video_format: str, user_output_override: str, use_fixed_viewport: bool, center_viewport: bool, viewport_x: int, viewport_y: int, chosen_skeletons: Optional[List[str]], export_local: bool = False):
-    auto_probe = (chosen_skeletons is None)
-    total_projs = len(selected_files)
-    progress = ap.Progress('Spine Export', infinite=(total_projs == 0))
-    progress.set_cancelable(True)
-
-    spine_exec = get_spine_executable()
-    if not ensure_file_exists(spine_exec, 'Spine executable'):
-        progress.finish(); return
+SPINE_RAM_PER_EXPORT_GB = 2.0  # rough working set of one Spine CLI video export
 
-    # Set up attribute tracking (non-fatal if API unavailable)
-    _api = None
+def _total_ram_gb() -> float:
+    system = platform.system().lower()
     try:
-        _api = ap.get_api()
-        dprint(f'API obtained: {_api}')
-        ensure_preview_status_attribute(_api)
+        if system.startswith('win'):
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+
+            stat = MEMORYSTATUSEX()
+            stat.dwLength = ctypes.sizeof(stat)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat))  # type: ignore[attr-defined]
+            return stat.ullTotalPhys / (1024.0 ** 3)
+        if system == 'darwin':
+            out = subprocess.run(['sysctl', '-n', 'hw.memsize'], capture_output=True, text=True, timeout=5).stdout
+            return int(out.strip()) / (1024.0 ** 3)
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024.0 ** 3)
     except Exception as e:
-        dprint(f'Attribute API unavailable, status tagging disabled: {e}')
-        _api = None
+        dprint(f'Could not determine installed RAM: {e}')
+        return 8.0
 
+def get_parallel_export_count(total_projects: int) -> int:
+    """Number of Spine CLI exports to run at once: the setting, or derived from cores and RAM."""
     try:
-        total_jobs = len(selected_files) * max(1, len(chosen_skeletons)) if not auto_probe else None
-        job_index = 0
-
-        for proj_index, proj in enumerate(selected_files, start=1):
-            proj_dir = os.path.dirname(proj)
-            base_name = os.path.splitext(os.path.basename(proj))[0]
-            ext = '.mov' if video_format == 'mov' else '.avi'
-            proj_prefix = f'[{proj_index}/{total_projs}]  {base_name}  \u2014  '
-
-            # Report project-level progress at the start of each project
-            progress.report_progress((proj_index - 1) / max(1, total_projs))
-            progress.set_text(f'{proj_prefix}Starting...')
-
-            # --- Local-drive export setup ---
-            actual_proj = proj
-            actual_proj_dir = proj_dir
-            local_tmp_parent: Optional[str] = None
-            files_before_export: set = set()
-
-            if export_local:
-                progress.set_text(f'{proj_prefix}Copying to local drive...')
-                try:
-                    local_tmp_parent = tempfile.mkdtemp(prefix='spine_local_')
-                    tmp_copy = os.path.join(local_tmp_parent, os.path.basename(proj_dir))
-                    shutil.copytree(proj_dir, tmp_copy)
-                    actual_proj_dir = tmp_copy
-                    actual_proj = os.path.join(tmp_copy, os.path.basename(proj))
-                    files_before_export = {os.path.join(actual_proj_dir, n) for n in os.listdir(actual_proj_dir)}
-                    dprint(f'Local copy: {proj_dir} \u2192 {tmp_copy}')
-                except Exception as e:
-                    dprint(f'Failed to copy to local drive: {e}')
-                    ui.show_error('Local copy failed', description=str(e))
-                    local_tmp_parent = None  # fall back to original paths
-
-            if auto_probe:
-                progress.set_text(f'{proj_prefix}Probing skeletons...')
-                probed = probe_skeletons_sync(actual_proj, spine_exec)
-                skeletons_to_do = probed if len(probed) > 1 else [None]
-                dprint(f'Auto-probe {os.path.basename(actual_proj)}: {probed} \u2192 skeletons_to_do={skeletons_to_do}')
+        configured = int(settings.get('max_parallel_exports', 0) or 0)
+    except (TypeError, ValueError):
+        configured = 0
+    if configured <= 0:
+        by_cpu = max(1, (os.cpu_count() or 2) // 2)
+        by_ram = max(1, int(_total_ram_gb() // SPINE_RAM_PER_EXPORT_GB) - 1)
+        configured = min(by_cpu, by_ram)
+    return max(1, min(configured, total_projects))
+
+
+class BatchProgress:
+    """Aggregates concurrently running export jobs into a single ap.Progress.
+
+    Jobs that reported a weight (their frame count) count proportionally; jobs that have
+    not are assumed to weigh as much as the average known job."""
+
+    def __init__(self, progress: ap.Progress, total_jobs: int):
+        self.progress = progress
+        self.total = max(1, total_jobs)
+        self.lock = threading.Lock()
+        self.fractions: Dict[str, float] = {}
+        self.texts: Dict[str, str] = {}
+        self.weights: Dict[str, float] = {}
+        self.finished = 0
+        self.finished_weight = 0.0
+        self.start_time = time.time()
+
+    @property
+    def canceled(self) -> bool:
+        return self.progress.canceled
+
+    def job(self, key: str) -> 'JobProgress':
+        return JobProgress(self, key)
+
+    def update(self, key: str, text: Optional[str] = None, fraction: Optional[float] = None):
+        with self.lock:
+            if text is not None:
+                self.texts.pop(key, None)
+                self.texts[key] = text  # most recently updated job goes last
+            if fraction is not None:
+                self.fractions[key] = max(0.0, min(1.0, fraction))
+            self._refresh()
+
+    def set_weight(self, key: str, weight: float):
+        with self.lock:
+            if weight > 0:
+                self.weights[key] = float(weight)
+
+    def finish_job(self, key: str):
+        with self.lock:
+            self.finished += 1
+            self.finished_weight += self._weight(key)
+            self.fractions.pop(key, None)
+            self.texts.pop(key, None)
+            self._refresh()
+
+    def _weight(self, key: str) -> float:
+        if key in self.weights:
+            return self.weights[key]
+        return sum(self.weights.values()) / len(self.weights) if self.weights else 1.0
+
+    def done_fraction(self) -> float:
+        avg = self._weight('')
+        total_weight = sum(self.weights.values()) + avg * (self.total - len(self.weights))
+        running = sum(self._weight(k) * f for k, f in self.fractions.items())
+        return min(1.0, (self.finished_weight + running) / total_weight) if total_weight > 0 else 0.0
+
+    def _refresh(self):
+        done = self.done_fraction()
+        self.progress.report_progress(done)
+        elapsed = time.time() - self.start_time
+        eta = f'  \u2022  ETA {format_eta(elapsed * (1.0 - done) / done)}' if done >= 0.01 and elapsed > 5 else ''
+        running = len(self.texts)
+        if running > 1:
+            latest = next(reversed(self.texts.values()))
+            self.progress.set_text(f'{self.finished}/{self.total} done{eta}  \u2022  {running} running  \u2014  {latest}')
+        elif running == 1 and self.total > 1:
+            self.progress.set_text(f'{self.finished}/{self.total} done{eta}  \u2014  {next(iter(self.texts.values()))}')
+        elif running == 1:
+            self.progress.set_text(next(iter(self.texts.values())))
+        else:
+            self.progress.set_text(f'{self.finished}/{self.total} done{eta}')
+
+
+class JobProgress:
+    """ap.Progress-like view on one job of a BatchProgress; report_progress takes the job's own fraction."""
+
+    def __init__(self, batch: BatchProgress, key: str):
+        self.batch = batch
+        self.key = key
+
+    @property
+    def canceled(self) -> bool:
+        return self.batch.canceled
+
+    def set_text(self, text: str):
+        self.batch.update(self.key, text=text)
+
+    def report_progress(self, fraction: float):
+        self.batch.update(self.key, fraction=fraction)
+
+    def set_weight(self, weight: float):
+        self.batch.set_weight(self.key, weight)
+
+
+_reserve_lock = threading.Lock()
+_reserved_outputs: set = set()
+
+def reserve_output_filename(path: str, also_in: Optional[str] = None) -> str:
+    """next_available_filename that is safe when several exports write into the same folder.
+
+    With also_in, the name must also be free in that folder (the local mirror of a project)."""
+    with _reserve_lock:
+        base, ext = os.path.splitext(path)
+        cand, i = path, 1
+        while (os.path.exists(cand) or cand in _reserved_outputs
+               or (also_in and os.path.exists(os.path.join(also_in, os.path.basename(cand))))):
+            cand = f'{base}_{i}{ext}'
+            i += 1
+        _reserved_outputs.add(cand)
+        return cand
+
+
+LOCAL_STAGE_MAX_AGE_DAYS = 30
+OUTPUT_EXTS = ('.mov', '.avi', '.mp4')
+
+def _is_export_output(name: str, is_dir: bool) -> bool:
+    """Videos, trace files and file-per-animation folders written by earlier exports."""
+    lower = name.lower()
+    if is_dir:
+        return any(lower.endswith('_' + fmt) or f'_{fmt}_' in lower for fmt in VIDEO_FORMATS + IMAGE_SEQUENCE_FORMATS)
+    return lower.endswith(OUTPUT_EXTS) or lower.endswith('_trace.txt')
+
+def _sync_file(src: str, dst: str, st: os.stat_result) -> bool:
+    """Copy src over dst unless dst already has the same size and mtime. Returns True if copied."""
+    try:
+        dst_st = os.stat(dst)
+        # 2s tolerance: network shares and FAT drives round timestamps
+        if dst_st.st_size == st.st_size and abs(dst_st.st_mtime - st.st_mtime) < 2.0:
+            return False
+    except OSError:
+        pass
+    ensure_dir(os.path.dirname(dst))
+    shutil.copy2(src, dst)
+    return True
+
+def _sync_tree(src_dir: str, dst_dir: str, skip_outputs: bool = False) -> Tuple[int, int]:
+    """Mirror src_dir into dst_dir: copy new or changed files and drop files gone from src.
+
+    Returns (files copied, bytes copied)."""
+    copied = nbytes = 0
+    seen = set()
+    ensure_dir(dst_dir)
+    with os.scandir(src_dir) as it:
+        for entry in it:
+            is_dir = entry.is_dir()
+            if skip_outputs and _is_export_output(entry.name, is_dir):
+                continue
+            seen.add(entry.name)
+            dst = os.path.join(dst_dir, entry.name)
+            if is_dir:
+                c, b = _sync_tree(entry.path, dst)
+                copied += c; nbytes += b
             else:
-                skeletons_to_do = chosen_skeletons
-
-            # Per-project status accumulators
-            proj_failed = False
-            proj_canceled = False
-            proj_timeout = False
-            proj_img_path_error = False
-            special_cli_log: str = ''  # log path from a special-result kill
-
-            for sk in skeletons_to_do:
-                job_index += 1
-                if progress.canceled:
-                    proj_canceled = True
-                    break
+                st = entry.stat()
+                if _sync_file(entry.path, dst, st):
+                    copied += 1; nbytes += st.st_size
+    with os.scandir(dst_dir) as it:
+        stale = [e for e in it if e.name not in seen and not (skip_outputs and _is_export_output(e.name, e.is_dir()))]
+    for entry in stale:
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try: os.remove(entry.path)
+            except OSError: pass
+    return copied, nbytes
 
-                settings_dict = build_export_settings_json_dict(video_format, width, height, fps, bg, single_file, use_fixed_viewport, center_viewport, viewport_x, viewport_y, sk)
-                temp_json = write_temp_export_json(settings_dict)
-
-                if user_output_override:
-                    if single_file:
-                        if looks_like_file(user_output_override):
-                            if sk:
-                                base_override, ext_override = os.path.splitext(user_output_override)
-                                target = next_available_filename(f'{base_override}_{sk}{ext_override}')
-                            else:
-                                target = next_available_filename(user_output_override)
-                        else:
-                            fname = f'{base_name}{("_" + sk) if sk else ""}{ext}'
-                            target = next_available_filename(os.path.join(user_output_override, fname))
-                    else:
-                        target = os.path.dirname(user_output_override) if looks_like_file(user_output_override) else user_output_override
-                        if not target:
-                            target = os.path.join(actual_proj_dir, f'{base_name}_{video_format}{("_" + sk) if sk else ""}')
-                else:
-                    if single_file:
-                        fname = f'{base_name}{("_" + sk) if sk else ""}{ext}'
-                        target = next_available_filename(os.path.join(actual_proj_dir, fname))
-                    else:
-                        target = os.path.join(actual_proj_dir, f'{base_name}_{video_format}{("_" + sk) if sk else ""}')
+def _evict_local_stages(stage_root: str):
+    cutoff = time.time() - LOCAL_STAGE_MAX_AGE_DAYS * 86400
+    try:
+        with os.scandir(stage_root) as it:
+            old = [e.path for e in it if e.is_dir() and e.stat().st_mtime < cutoff]
+    except OSError:
+        return
+    for path in old:
+        dprint(f'Removing unused local mirror: {path}')
+        shutil.rmtree(path, ignore_errors=True)
+
+def _discard_outputs(local_dir: str):
+    """Remove export outputs from a mirror; only a crashed or killed run leaves them there."""
+    with os.scandir(local_dir) as it:
+        leftovers = [e for e in it if _is_export_output(e.name, e.is_dir())]
+    for entry in leftovers:
+        dprint(f'Discarding output of an interrupted run: {entry.path}')
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try: os.remove(entry.path)
+            except OSError: pass
+
+def stage_project_locally(proj: str, analysis: dict) -> Optional[Tuple[str, str, int, int]]:
+    """Sync the inputs of a project into its persistent local mirror.
+
+    Each .spine file has a mirror of its own, so projects sharing a folder can render in
+    parallel without seeing each other's outputs. Only the .spine file and the images
+    folders from the analysis are synced; when those are unknown, the project folder minus
+    earlier export outputs. Files with unchanged size and mtime are not copied again.
+    Outputs left in the mirror by an interrupted run are discarded. Returns (local project file, local project folder,
+    files copied, bytes copied), or None if images live outside the project folder and the
+    project has to be exported from its original location."""
+    proj_dir = os.path.dirname(os.path.abspath(proj))
+    image_dirs = {d for d in (analysis.get('images') or {}).values() if d}
+    rel_dirs = []
+    for d in sorted(image_dirs):
+        rel = os.path.relpath(d, proj_dir) if os.path.splitdrive(d)[0].lower() == os.path.splitdrive(proj_dir)[0].lower() else d
+        if os.path.isabs(rel) or rel == '..' or rel.startswith('..' + os.sep):
+            dprint(f'Images of {os.path.basename(proj)} live outside the project folder ({d}) \u2014 exporting in place')
+            return None
+        rel_dirs.append(rel)
+
+    stage_root = user_data_dir('local_stage')
+    _evict_local_stages(stage_root)
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(proj)).encode('utf-8')).hexdigest()[:16]
+    mirror = os.path.join(stage_root, key)
+    local_dir = os.path.join(mirror, os.path.basename(proj_dir))
+    ensure_dir(local_dir)
+    os.utime(mirror)  # keeps the mirror from being evicted
+    local_proj = os.path.join(local_dir, os.path.basename(proj))
+
+    if not rel_dirs or '.' in rel_dirs:
+        copied, nbytes = _sync_tree(proj_dir, local_dir, skip_outputs=True)
+    else:
+        copied = 1 if _sync_file(proj, local_proj, os.stat(proj)) else 0
+        nbytes = os.path.getsize(proj) if copied else 0
+        for rel in rel_dirs:
+            c, b = _sync_tree(os.path.join(proj_dir, rel), os.path.join(local_dir, rel))
+            copied += c; nbytes += b
+    _discard_outputs(local_dir)
+    return local_proj, local_dir, copied, nbytes
+
+EXPORT_FINGERPRINT_KEYS = ('width', 'height', 'fps', 'bg', 'single_file', 'video_format', 'user_output_override',
+                           'use_fixed_viewport', 'center_viewport', 'viewport_x', 'viewport_y', 'chosen_skeletons', 'profile')
+
+def export_settings_key(opts: dict) -> str:
+    """Stable text form of the export settings that affect the rendered output."""
+    relevant = {k: opts.get(k) for k in EXPORT_FINGERPRINT_KEYS}
+    relevant['encoder'] = export_profile(opts.get('profile'))
+    return json.dumps(relevant, sort_keys=True)
+
+def _hash_tree(h, root: str, skip_outputs: bool = False):
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        h.update(f'missing:{root}'.encode('utf-8'))
+        return
+    for entry in entries:
+        is_dir = entry.is_dir()
+        if skip_outputs and _is_export_output(entry.name, is_dir):
+            continue
+        if is_dir:
+            h.update(f'd:{entry.name}'.encode('utf-8'))
+            _hash_tree(h, entry.path)
+        else:
+            st = entry.stat()
+            h.update(f'f:{entry.name}:{st.st_size}:{st.st_mtime_ns}'.encode('utf-8'))
+
+def export_fingerprint(proj: str, analysis: dict, settings_key: str,
+                       images_fingerprint: Optional[str] = None) -> Optional[str]:
+    """Fingerprint of everything an export reads: the .spine file, its images folders
+    (or the project folder when those are unknown), the export settings and Spine version.
+    images_fingerprint is the _images_fingerprint already taken in this run, if any."""
+    if not analysis.get('ok'):
+        return None
+    h = hashlib.sha1()
+    try:
+        st = os.stat(proj)
+    except OSError:
+        return None
+    h.update(f'{os.path.normcase(os.path.abspath(proj))}:{st.st_size}:{st.st_mtime_ns}'.encode('utf-8'))
+    h.update(f"{analysis.get('spine_version', '')}|{settings_key}".encode('utf-8'))
+    h.update(f'images:{images_fingerprint or _images_fingerprint(proj, analysis)}'.encode('utf-8'))
+    return h.hexdigest()
 
-                ensure_dir(os.path.dirname(target) if looks_like_file(target) else target)
 
-                sk_label = f'skeleton: {sk}' if sk else ''
-                if not auto_probe:
-                    progress.set_text(f'{proj_prefix}{job_index}/{total_jobs} \u2192 Exporting {sk_label}')
-                else:
-                    progress.set_text(f'{proj_prefix}Exporting {sk_label}')
+class ExportState:
+    """Input fingerprint and outputs of the last 'Done' export of each project, used to
+    skip unchanged projects in incremental batch exports. Thread-safe."""
 
-                repaint_nudge = None if auto_probe else ((job_index - 1) / max(1.0, float(total_jobs)) + 0.0001)
-                ok, maybe_log = run_spine_cli_with_progress(
-                    spine_exec, actual_proj, target, temp_json, progress, 0.5,
-                    repaint_nudge=repaint_nudge, progress_prefix=proj_prefix,
-                )
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(user_data_dir(), 'export_state.json')
+        self.lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries: Dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def _key(proj: str) -> str:
+        return os.path.normcase(os.path.abspath(proj))
+
+    def is_current(self, proj: str, fingerprint: Optional[str]) -> bool:
+        """True if proj was exported with these exact inputs and all its outputs still exist."""
+        if not fingerprint:
+            return False
+        with self.lock:
+            entry = self.entries.get(self._key(proj))
+        if not entry or entry.get('fingerprint') != fingerprint or not entry.get('outputs'):
+            return False
+        return all(os.path.exists(p) for p in entry['outputs'])
+
+    def record(self, proj: str, fingerprint: Optional[str], outputs: List[str]):
+        if not fingerprint or not outputs:
+            return
+        with self.lock:
+            self.entries[self._key(proj)] = {'fingerprint': fingerprint, 'outputs': outputs, 'time': time.time()}
+            self._save()
 
-                try: os.remove(temp_json)
-                except Exception: pass
+    def forget(self, proj: str):
+        with self.lock:
+            if self.entries.pop(self._key(proj), None) is not None:
+                self._save()
 
-                if maybe_log == 'canceled':
-                    proj_canceled = True
-                    break
+    def _save(self):
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            dprint(f'Could not write export state: {e}')
+
+
+JOURNAL_KEEP = 20
+
+class BatchJournal:
+    """Append-only JSON-lines journal of one batch export, kept in the user data dir.
+
+    Records are 'batch' (projects and export_worker arguments), 'project' and 'skeleton'
+    state changes (running, done, failed, canceled, skipped; with outputs and trace
+    path), 'resume' and 'end'. Replaying the file gives the last state of every project
+    and skeleton, so an interrupted batch can be resumed without redoing finished work.
+    A torn last line from a crash is ignored. Thread-safe."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.batch: dict = {}
+        self.projects: Dict[str, dict] = {}
+        self.skeletons: Dict[Tuple[str, str], dict] = {}
+        self.ended: Optional[dict] = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
 
-                # Detect special sentinel codes returned as 'sentinel:log_path'
-                if maybe_log.startswith('timeout:'):
-                    proj_timeout = True
-                    special_cli_log = maybe_log[len('timeout:'):]
-                    dprint(f'Timeout detected for {os.path.basename(proj)} — moving to next')
-                    break
-                if maybe_log.startswith('img_path_not_found:'):
-                    proj_img_path_error = True
-                    special_cli_log = maybe_log[len('img_path_not_found:'):]
-                    dprint(f'IMG path not found for {os.path.basename(proj)} — moving to next')
-                    break
+    @staticmethod
+    def journal_dir() -> str:
+        return user_data_dir('journal')
+
+    @classmethod
+    def start(cls, projects: List[str], export_args: dict) -> 'BatchJournal':
+        folder = cls.journal_dir()
+        journal = cls(os.path.join(folder, time.strftime('batch_%Y%m%d_%H%M%S') + f'_{os.getpid()}.jsonl'))
+        journal._append({'event': 'batch', 'projects': projects, 'export': export_args})
+        old = sorted((e.path for e in os.scandir(folder) if e.name.endswith('.jsonl')), reverse=True)[JOURNAL_KEEP:]
+        for path in old:
+            try: os.remove(path)
+            except OSError: pass
+        return journal
+
+    @classmethod
+    def load_last(cls) -> Optional['BatchJournal']:
+        try:
+            names = sorted(n for n in os.listdir(cls.journal_dir()) if n.endswith('.jsonl'))
+        except OSError:
+            return None
+        return cls(os.path.join(cls.journal_dir(), names[-1])) if names else None
+
+    def _apply(self, rec: dict):
+        event = rec.get('event')
+        if event == 'batch':
+            self.batch = rec
+        elif event == 'project':
+            self.projects[rec['project']] = rec
+        elif event == 'skeleton':
+            self.skeletons[(rec['project'], rec.get('skeleton') or '')] = rec
+        elif event == 'end':
+            self.ended = rec
+        elif event == 'resume':
+            self.ended = None
+
+    def _append(self, rec: dict):
+        rec['time'] = time.time()
+        line = json.dumps(rec, ensure_ascii=False)
+        with self.lock:
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+            except OSError as e:
+                dprint(f'Could not write batch journal: {e}')
+            self._apply(rec)
+
+    def project(self, proj: str, state: str, **details):
+        self._append(dict(event='project', project=proj, state=state, **details))
+
+    def skeleton(self, proj: str, skeleton: Optional[str], state: str, **details):
+        self._append(dict(event='skeleton', project=proj, skeleton=skeleton or '', state=state, **details))
+
+    def resumed(self):
+        self._append({'event': 'resume'})
+
+    def end(self, canceled: bool):
+        self._append({'event': 'end', 'canceled': canceled})
+
+    def pending_projects(self) -> List[str]:
+        """Projects of the batch that have not finished (done or skipped) yet, in order."""
+        with self.lock:
+            return [p for p in self.batch.get('projects', [])
+                    if self.projects.get(p, {}).get('state') not in ('done', 'skipped')]
+
+    @property
+    def resumable(self) -> bool:
+        # A batch that ran to its end without being canceled has nothing left to resume
+        return bool(self.batch) and not (self.ended and not self.ended.get('canceled')) and bool(self.pending_projects())
+
+    def finished_output(self, proj: str, skeleton: Optional[str]) -> Optional[str]:
+        """Output of a skeleton job that finished in this batch and still exists, else None."""
+        with self.lock:
+            rec = self.skeletons.get((proj, skeleton or ''))
+        if rec and rec.get('state') == 'done' and rec.get('output') and os.path.exists(rec['output']):
+            return rec['output']
+        return None
 
-                if not ok:
-                    proj_failed = True
-                    label_failed = f'{os.path.basename(proj)}{(" \u00b7 " + sk) if sk else ""}'
-                    if maybe_log:
-                        dprint(f'Export failed for {label_failed} — log: {maybe_log}')
-                        ui.show_error(f'Export failed: {label_failed}', description=f'Log saved to: {maybe_log}')
+
+def resume_last_batch() -> Optional[List[str]]:
+    """Continue the most recent interrupted batch with its original settings.
+
+    Returns the statuses of the resumed projects, or None if there is nothing to resume."""
+    journal = BatchJournal.load_last()
+    if journal is None or not journal.resumable:
+        ui.show_info('Nothing to resume', 'The last batch export finished completely.')
+        return None
+    pending = journal.pending_projects()
+    dprint(f'Resuming batch {os.path.basename(journal.path)}: {len(pending)} of {len(journal.batch["projects"])} project(s) left')
+    journal.resumed()
+    return export_worker(pending, journal=journal, **journal.batch['export'])
+
+
+REPORT_KEEP = 20
+REPORT_PHASES = ('analysis', 'stage', 'render', 'check', 'move_back')
+
+class BatchReport:
+    """Wall time per export phase of every project in a batch: analysis, local copy
+    ('stage'), render, missing-image check and move-back, plus the bytes rendered and
+    copied. Written as JSON lines and CSV to the user data dir when the batch ends.
+
+    Records are plain dicts handed out by project(); each is filled by the thread
+    exporting that project and, later, by the move-back thread."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = threading.Lock()
+        self.records: List[dict] = []
+        self.started = time.time()
+        self.elapsed = 0.0
+
+    @staticmethod
+    def new_record(proj: str) -> dict:
+        return {'project': proj, 'status': '', 'phases': {}, 'bytes_written': 0, 'stage_bytes': 0}
+
+    def project(self, proj: str) -> dict:
+        rec = self.new_record(proj)
+        with self.lock:
+            self.records.append(rec)
+        return rec
+
+    @staticmethod
+    def add(rec: dict, phase: str, secs: float):
+        rec['phases'][phase] = round(rec['phases'].get(phase, 0.0) + secs, 3)
+
+    @staticmethod
+    def row(rec: dict) -> dict:
+        """Flat copy of a record with total time and render speed."""
+        render = rec['phases'].get('render', 0.0)
+        out = {'project': rec['project'], 'status': rec['status'],
+               'total_secs': round(sum(rec['phases'].values()), 3)}
+        for phase in REPORT_PHASES:
+            out[f'{phase}_secs'] = rec['phases'].get(phase, 0.0)
+        out['bytes_written'] = rec['bytes_written']
+        out['render_mb_per_s'] = round(_format_bytes_to_mb(rec['bytes_written']) / render, 3) if render > 0 else 0.0
+        out['stage_bytes'] = rec['stage_bytes']
+        return out
+
+    def finish(self) -> Tuple[str, str]:
+        """Write the report files, drop old ones and return (jsonl_path, csv_path)."""
+        self.elapsed = time.time() - self.started
+        folder = user_data_dir('reports')
+        with self.lock:
+            rows = [self.row(rec) for rec in self.records]
+        jsonl_path = os.path.join(folder, self.name + '.jsonl')
+        csv_path = os.path.join(folder, self.name + '.csv')
+        try:
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                for r in rows:
+                    f.write(json.dumps(r) + '\n')
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['project'])
+                writer.writeheader()
+                writer.writerows(rows)
+        except OSError as e:
+            dprint(f'Could not write batch report: {e}')
+        for ext in ('.jsonl', '.csv'):
+            old = sorted((e.path for e in os.scandir(folder) if e.name.endswith(ext)), reverse=True)[REPORT_KEEP:]
+            for path in old:
+                try: os.remove(path)
+                except OSError: pass
+        return jsonl_path, csv_path
+
+    def summary_lines(self, top: int = 5) -> List[str]:
+        with self.lock:
+            rows = [self.row(rec) for rec in self.records]
+        if not rows:
+            return []
+        written = sum(r['bytes_written'] for r in rows)
+        lines = [f'{len(rows)} project(s) in {format_eta(self.elapsed)}, {_format_bytes_to_mb(written):.1f} MB rendered']
+        totals = {phase: sum(r[f'{phase}_secs'] for r in rows) for phase in REPORT_PHASES}
+        spent = sum(totals.values()) or 1.0
+        lines.append('Time per phase: ' + ', '.join(
+            f'{phase} {format_eta(secs)} ({secs / spent * 100:.0f}%)'
+            for phase, secs in sorted(totals.items(), key=lambda kv: kv[1], reverse=True) if secs > 0))
+        lines.append('Slowest projects:')
+        for r in sorted(rows, key=lambda r: r['total_secs'], reverse=True)[:top]:
+            phase = max(REPORT_PHASES, key=lambda ph: r[f'{ph}_secs'])
+            speed = f', {r["render_mb_per_s"]:.1f} MB/s' if r['render_mb_per_s'] else ''
+            lines.append(f'  {os.path.basename(r["project"])}  {format_eta(r["total_secs"])}  '
+                         f'(mostly {phase}{speed})  \u2014  {r["status"]}')
+        return lines
+
+
+def show_batch_report(report: BatchReport, csv_path: str):
+    """Summary of the slowest projects and phases; logged instead when running headless."""
+    lines = report.summary_lines()
+    if not lines:
+        return
+    for line in lines:
+        dprint(line)
+    dprint(f'Batch report: {csv_path}')
+    if ap is None or isinstance(ui, HeadlessUI):
+        return
+    d = ap.Dialog()
+    d.title = 'Batch export timings'
+    for line in lines:
+        d.add_text(line.strip())
+    d.add_button('Open report', callback=lambda dlg: open_path_in_os(csv_path))
+    d.add_button('Close', callback=lambda dlg: dlg.close())
+    d.show()
+
+
+def prepare_project(proj: str, spine_exec: str, export_local: bool, canceled: Callable[[], bool],
+                    export_state: Optional[ExportState] = None, settings_key: str = '') -> dict:
+    """Analysis of a project plus, in local-drive mode, its synced local mirror.
+
+    Returns a dict with 'analysis', 'images_fingerprint' (taken once here and reused by
+    the post-render check), 'staged' (stage_project_locally result or None), 'error',
+    'fingerprint', 'unchanged' and 'timings' (seconds spent on 'analysis' and 'stage'). With
+    export_state, projects whose inputs match their last 'Done' export are flagged
+    'unchanged' and not staged."""
+    started = time.time()
+    prep = {'analysis': analyze_project(proj, spine_exec, canceled=canceled), 'staged': None, 'error': '',
+            'fingerprint': None, 'unchanged': False, 'timings': {}}
+    prep['timings']['analysis'] = time.time() - started
+    prep['images_fingerprint'] = prep['analysis'].get('images_fingerprint')
+    if export_state is not None:
+        prep['fingerprint'] = export_fingerprint(proj, prep['analysis'], settings_key, prep['images_fingerprint'])
+        if export_state.is_current(proj, prep['fingerprint']):
+            prep['unchanged'] = True
+            return prep
+    if export_local and not canceled():
+        started = time.time()
+        try:
+            staged = stage_project_locally(proj, prep['analysis'])
+            if staged:
+                local_dir = staged[1]
+                prep['staged'] = staged
+                dprint(f'Local mirror: {os.path.dirname(proj)} \u2192 {local_dir} ({staged[2]} file(s), {_format_bytes_to_mb(staged[3]):.1f} MB copied)')
+        except Exception as e:
+            dprint(f'Failed to sync to local drive: {e}')
+            prep['error'] = str(e)
+        prep['timings']['stage'] = time.time() - started
+    return prep
+
+def move_outputs_back(paths: List[str], proj_dir: str):
+    """Move the outputs an export wrote into the local mirror (its targets and trace file)
+    back into the project folder. Paths that were never created are skipped."""
+    for full in paths:
+        try:
+            if os.path.isfile(full) or os.path.isdir(full):
+                dest = os.path.join(proj_dir, os.path.basename(os.path.normpath(full)))
+                _move_output_back(full, dest)
+                dprint(f'Moved {full} \u2192 {dest}')
+        except Exception as e:
+            dprint(f'Failed to move {full} back: {e}')
+
+
+class StagingPipeline:
+    """Overlaps network I/O with rendering in local-drive batch exports.
+
+    A staging pool prepares (analyzes and syncs) the next projects while the current ones
+    render, keeping up to lookahead projects ready ahead of the last one requested, and a
+    move-back pool returns finished outputs to the share in the background."""
+
+    def __init__(self, projects: List[str], spine_exec: str, lookahead: int, canceled: Callable[[], bool], stage_workers: int = 1,
+                 export_state: Optional[ExportState] = None, settings_key: str = ''):
+        self.projects = projects
+        self.spine_exec = spine_exec
+        self.export_state = export_state
+        self.settings_key = settings_key
+        self.lookahead = max(1, lookahead)
+        self.canceled = canceled
+        self.stage_pool = ThreadPoolExecutor(max_workers=max(1, stage_workers))
+        self.move_pool = ThreadPoolExecutor(max_workers=1)
+        self.lock = threading.Lock()
+        self.futures: Dict[int, object] = {}
+        self.submitted = 0
+        self.moves: List[object] = []
+        self._prefetch(0)
+
+    def _prefetch(self, upto_index: int):
+        with self.lock:
+            while self.submitted < min(len(self.projects), upto_index + self.lookahead):
+                proj = self.projects[self.submitted]
+                self.submitted += 1
+                self.futures[self.submitted] = self.stage_pool.submit(prepare_project, proj, self.spine_exec, True, self.canceled,
+                                                                       self.export_state, self.settings_key)
+
+    def prepared(self, proj_index: int) -> dict:
+        """Blocking: preparation result of the project with this 1-based index."""
+        self._prefetch(proj_index)
+        with self.lock:
+            future = self.futures.pop(proj_index)
+        return future.result()
+
+    def move_back(self, paths: List[str], proj_dir: str, on_done: Optional[Callable[[float], None]] = None):
+        """Queue moving a project's outputs back; on_done gets the seconds the move took."""
+        def run():
+            started = time.time()
+            move_outputs_back(paths, proj_dir)
+            if on_done is not None:
+                on_done(time.time() - started)
+        with self.lock:
+            self.moves.append(self.move_pool.submit(run))
+
+    def pending_moves(self) -> int:
+        with self.lock:
+            return sum(1 for f in self.moves if not f.done())
+
+    def close(self):
+        self.stage_pool.shutdown(wait=True, cancel_futures=True)
+        self.move_pool.shutdown(wait=True)
+
+
+def _move_output_back(src: str, dest: str, in_folder: bool = False):
+    """Move an export output into the project folder, merging into existing folders.
+
+    Inside a folder output (image sequences, file-per-animation videos) files are replaced,
+    as Spine does when exporting in place. A single-file render already in the project
+    folder is never replaced: a clashing one is moved back as name_1.ext. The trace file is
+    rewritten, as a non-local export does."""
+    if os.path.isdir(src) and os.path.isdir(dest):
+        for name in os.listdir(src):
+            _move_output_back(os.path.join(src, name), os.path.join(dest, name), in_folder=True)
+        shutil.rmtree(src, ignore_errors=True)
+        return
+    if os.path.lexists(dest):
+        if in_folder or (os.path.isfile(dest) and dest.lower().endswith('_trace.txt')):
+            if os.path.isdir(dest) and not os.path.islink(dest):
+                shutil.rmtree(dest)
+            else:
+                os.remove(dest)
+        else:
+            renamed = next_available_filename(dest)
+            dprint(f'{dest} already exists, keeping it and moving the new output to {renamed}')
+            dest = renamed
+    shutil.move(src, dest)
+
+
+def export_project(proj: str, proj_index: int, total_projs: int, opts: dict, spine_exec: str, progress: JobProgress, api, api_lock: threading.Lock) -> str:
+    """Export every skeleton of one project, write its trace file and tag its folder.
+
+    Returns the Preview Status written for the project, 'Canceled', or 'Skipped' when an
+    incremental batch finds the project unchanged since its last 'Done' export."""
+    chosen_skeletons = opts['chosen_skeletons']
+    auto_probe = (chosen_skeletons is None)
+    video_format = opts['video_format']
+    # Image sequences are always written as a folder per skeleton
+    single_file = opts['single_file'] and video_format in VIDEO_FORMATS
+    user_output_override = opts['user_output_override']
+
+    proj_dir = os.path.dirname(proj)
+    base_name = os.path.splitext(os.path.basename(proj))[0]
+    ext = '.mov' if video_format == 'mov' else '.avi'
+    proj_prefix = f'[{proj_index}/{total_projs}]  {base_name}  \u2014  '
+
+    if progress.canceled:
+        return 'Canceled'
+    progress.set_text(f'{proj_prefix}Starting...')
+
+    # --- Analysis and local-drive setup (prefetched by the pipeline in batch mode) ---
+    pipeline: Optional[StagingPipeline] = opts.get('pipeline')
+    if pipeline is not None:
+        progress.set_text(f'{proj_prefix}Waiting for local sync...')
+        prep = pipeline.prepared(proj_index)
+    else:
+        if opts['export_local']:
+            progress.set_text(f'{proj_prefix}Syncing to local drive...')
+        else:
+            progress.set_text(f'{proj_prefix}Probing skeletons...' if auto_probe else f'{proj_prefix}Reading animations...')
+        prep = prepare_project(proj, spine_exec, opts['export_local'], lambda: progress.canceled,
+                               opts.get('export_state'), opts.get('settings_key', ''))
+    journal: Optional[BatchJournal] = opts.get('journal')
+    report: Optional[BatchReport] = opts.get('report')
+    timing = report.project(proj) if report is not None else BatchReport.new_record(proj)
+    for phase, secs in prep['timings'].items():
+        BatchReport.add(timing, phase, secs)
+    if prep['staged'] is not None:
+        timing['stage_bytes'] = prep['staged'][3]
+    if prep['unchanged']:
+        dprint(f'Skipping {os.path.basename(proj)}: unchanged since its last export')
+        if journal is not None:
+            journal.project(proj, 'skipped', status='Skipped')
+        timing['status'] = 'Skipped'
+        return 'Skipped'
+    if journal is not None:
+        journal.project(proj, 'running')
+    analysis = prep['analysis']
+    if prep['error']:
+        ui.show_error('Local copy failed', description=prep['error'])
+
+    # Falls back to the original paths when the project was not staged
+    staged_locally = prep['staged'] is not None
+    actual_proj, actual_proj_dir = prep['staged'][:2] if staged_locally else (proj, proj_dir)
+    mirror_outputs: List[str] = []  # targets written into the local mirror, moved back at the end
+
+    def final_path(path: str) -> str:
+        """Where an output written next to the (possibly mirrored) project ends up."""
+        if staged_locally and os.path.dirname(os.path.normpath(path)) == os.path.normpath(actual_proj_dir):
+            return os.path.join(proj_dir, os.path.basename(os.path.normpath(path)))
+        return path
+    if auto_probe:
+        probed = analysis['skeletons']
+        skeletons_to_do = probed if len(probed) > 1 else [None]
+        dprint(f'Auto-probe {os.path.basename(actual_proj)}: {probed} \u2192 skeletons_to_do={skeletons_to_do}')
+    else:
+        skeletons_to_do = chosen_skeletons
+
+    # Frame counts per skeleton job drive the in-job percentage and the batch weighting
+    job_frames = [animation_frames(analysis, sk, opts['fps']) for sk in skeletons_to_do]
+    frame_totals = [sum(f.values()) for f in job_frames]
+    if all(frame_totals):
+        progress.set_weight(sum(frame_totals))
+    else:
+        frame_totals = [1] * len(skeletons_to_do)
+    job_bounds = [sum(frame_totals[:i]) / float(sum(frame_totals)) for i in range(len(frame_totals) + 1)]
+
+    # Per-project status accumulators
+    proj_failed = False
+    proj_canceled = False
+    proj_timeout = False
+    proj_timeout_secs = 0.0
+    proj_attempts = 0
+    proj_img_path_error = False
+    special_cli_log: str = ''  # log path from a special-result kill
+    outputs: List[str] = []  # final output paths, for incremental batches
+    total_jobs = len(skeletons_to_do)
+
+    for job_index, sk in enumerate(skeletons_to_do, start=1):
+        if progress.canceled:
+            proj_canceled = True
+            break
+
+        # Resumed batch: skeletons finished before the interruption are not rendered again
+        done_output = journal.finished_output(proj, sk) if journal is not None else None
+        if done_output:
+            label_done = os.path.basename(proj) + (f' \u00b7 {sk}' if sk else '')
+            dprint(f'Resume: {label_done} already exported to {done_output}')
+            outputs.append(done_output)
+            progress.report_progress(job_bounds[job_index])
+            continue
+
+        settings_dict = build_export_settings_json_dict(video_format, opts['width'], opts['height'], opts['fps'], opts['bg'], single_file, opts['use_fixed_viewport'], opts['center_viewport'], opts['viewport_x'], opts['viewport_y'], sk, opts['profile'])
+        temp_json = write_temp_export_json(settings_dict)
+
+        if user_output_override:
+            if single_file:
+                if looks_like_file(user_output_override):
+                    if sk:
+                        base_override, ext_override = os.path.splitext(user_output_override)
+                        target = reserve_output_filename(f'{base_override}_{sk}{ext_override}')
                     else:
-                        dprint(f'Export failed for {label_failed}')
-                        ui.show_error(f'Export failed: {label_failed}')
+                        target = reserve_output_filename(user_output_override)
                 else:
-                    if single_file:
-                        shown = target if (looks_like_file(target) and os.path.isfile(target)) else latest_file_in(os.path.dirname(target) if looks_like_file(target) else target, exts=['.mov', '.avi'])
-                        ui.show_success('Export finished', os.path.basename(shown) if shown else 'Done.')
-                    else:
-                        ui.show_success('Export finished', f'Saved to folder: {target}')
+                    fname = f'{base_name}{("_" + sk) if sk else ""}{ext}'
+                    target = reserve_output_filename(os.path.join(user_output_override, fname))
+            else:
+                target = os.path.dirname(user_output_override) if looks_like_file(user_output_override) else user_output_override
+                if not target:
+                    target = os.path.join(actual_proj_dir, f'{base_name}_{video_format}{("_" + sk) if sk else ""}')
+        else:
+            if single_file:
+                fname = f'{base_name}{("_" + sk) if sk else ""}{ext}'
+                # Reserved against the project folder so a mirrored export never replaces an
+                # earlier render there; the mirror only has to be free of the name as well
+                final_name = reserve_output_filename(os.path.join(proj_dir, fname), also_in=actual_proj_dir if staged_locally else None)
+                target = os.path.join(actual_proj_dir, os.path.basename(final_name))
+            else:
+                target = os.path.join(actual_proj_dir, f'{base_name}_{video_format}{("_" + sk) if sk else ""}')
 
-                if not auto_probe:
-                    progress.report_progress(job_index / float(total_jobs))
+        ensure_dir(os.path.dirname(target) if looks_like_file(target) else target)
+        if final_path(target) != target:
+            mirror_outputs.append(target)
 
-            trace_path = os.path.join(actual_proj_dir, f'{base_name}_trace.txt')
+        sk_label = f'skeleton: {sk}' if sk else ''
+        if total_jobs > 1:
+            progress.set_text(f'{proj_prefix}{job_index}/{total_jobs} \u2192 Exporting {sk_label}')
+        else:
+            progress.set_text(f'{proj_prefix}Exporting {sk_label}')
+
+        if journal is not None:
+            journal.skeleton(proj, sk, 'running', output=final_path(target))
+        repaint_nudge = job_bounds[job_index - 1] + 0.0001
+        frames = job_frames[job_index - 1]
+        # Start-up timeout from this job's history (or the project size); a run that never
+        # produces output is retried with backoff before the project is given up
+        history_job = f'export:{sk or ""}'
+        timeout_secs = adaptive_timeout(proj, history_job, EXPORT_TIMEOUT_SECS,
+                                        lambda: _project_input_bytes(actual_proj, analysis))
+        retries = timeout_retries()
+        render_started = time.time()
+        for attempt in range(1, retries + 2):
+            cli_stats: dict = {}
+            ok, maybe_log = run_spine_cli_with_progress(
+                spine_exec, actual_proj, target, temp_json, progress, 0.5,
+                timeout_secs=timeout_secs, repaint_nudge=repaint_nudge, progress_prefix=proj_prefix,
+                frame_progress=FrameProgress(frames) if frames else None,
+                progress_range=(job_bounds[job_index - 1], job_bounds[job_index]),
+                stats=cli_stats,
+            )
+            proj_timeout_secs, proj_attempts = timeout_secs, attempt
+            if ok:
+                timing_history().record(proj, history_job, cli_stats.get('elapsed', 0.0), cli_stats.get('first_output'))
+                timing['bytes_written'] += cli_stats.get('bytes', 0)
+            if not maybe_log.startswith('timeout:') or attempt > retries:
+                break
+            try: os.remove(maybe_log[len('timeout:'):])
+            except OSError: pass
+            dprint(f'No output from {os.path.basename(proj)} after {timeout_secs:.0f}s — retry {attempt}/{retries}')
+            progress.set_text(f'{proj_prefix}No output after {timeout_secs:.0f}s, retrying ({attempt}/{retries})...')
+            if not wait_before_retry(attempt, lambda: progress.canceled):
+                ok, maybe_log = False, 'canceled'
+                break
+            timeout_secs = min(timeout_secs * TIMEOUT_RETRY_GROWTH, EXPORT_TIMEOUT_MAX_SECS)
+        BatchReport.add(timing, 'render', time.time() - render_started)
+
+        try: os.remove(temp_json)
+        except Exception: pass
 
-            if proj_timeout or proj_img_path_error:
-                # Write trace with CLI log content, then move on — no missing image check
-                if proj_timeout:
-                    _write_status_trace(trace_path, actual_proj, 'Export Not Started',
-                                        f'No output file was detected after {EXPORT_TIMEOUT_SECS:.0f}s. '
-                                        'The Spine CLI may have launched but never started encoding.',
-                                        cli_log_path=special_cli_log)
-                else:
-                    _write_status_trace(trace_path, actual_proj, 'IMG Path Not Found',
-                                        'Spine reported that the images path could not be found. '
-                                        'Check that the images folder exists next to the project.',
-                                        cli_log_path=special_cli_log)
-                try:
-                    if special_cli_log and os.path.isfile(special_cli_log):
-                        os.remove(special_cli_log)
-                except Exception: pass
-                check_result: dict = {}
-            elif proj_failed or proj_canceled:
-                check_result = {}
-                _write_status_trace(trace_path, actual_proj,
-                                    'Canceled' if proj_canceled else 'Export Failed')
+        if journal is not None and not ok:
+            journal.skeleton(proj, sk, 'canceled' if maybe_log == 'canceled' else 'failed', output=final_path(target))
+
+        if maybe_log == 'canceled':
+            proj_canceled = True
+            break
+
+        # Detect special sentinel codes returned as 'sentinel:log_path'
+        if maybe_log.startswith('timeout:'):
+            proj_timeout = True
+            special_cli_log = maybe_log[len('timeout:'):]
+            dprint(f'Timeout detected for {os.path.basename(proj)} — moving to next')
+            break
+        if maybe_log.startswith('img_path_not_found:'):
+            proj_img_path_error = True
+            special_cli_log = maybe_log[len('img_path_not_found:'):]
+            dprint(f'IMG path not found for {os.path.basename(proj)} — moving to next')
+            break
+
+        if not ok:
+            proj_failed = True
+            label_failed = os.path.basename(proj) + (f' \u00b7 {sk}' if sk else '')
+            if maybe_log:
+                dprint(f'Export failed for {label_failed} — log: {maybe_log}')
+                ui.show_error(f'Export failed: {label_failed}', description=f'Log saved to: {maybe_log}')
             else:
-                # Successful export: run missing-image check and always write trace
-                progress.set_text(f'{proj_prefix}Checking for missing images...')
-                check_result = check_missing_images_in_project(actual_proj, spine_exec)
-                write_missing_images_trace(trace_path, actual_proj, check_result)
-
-            # Move exported files + trace back from local temp copy, then clean up
-            if export_local and local_tmp_parent and os.path.isdir(actual_proj_dir):
-                progress.set_text(f'{proj_prefix}Moving exported files back...')
-                try:
-                    for name in os.listdir(actual_proj_dir):
-                        full = os.path.join(actual_proj_dir, name)
-                        if full not in files_before_export and (os.path.isfile(full) or os.path.isdir(full)):
-                            dest = os.path.join(proj_dir, name)
-                            shutil.move(full, dest)
-                            dprint(f'Moved {full} \u2192 {dest}')
-                except Exception as e:
-                    dprint(f'Failed to move files back: {e}')
-                try:
-                    shutil.rmtree(local_tmp_parent, ignore_errors=True)
-                    dprint(f'Cleaned up local temp: {local_tmp_parent}')
-                except Exception as e:
-                    dprint(f'Failed to cleanup temp: {e}')
-
-            # Write Preview Status attribute for this project's folder
-            if _api is not None and not proj_canceled:
-                if proj_timeout:
-                    folder_status = 'Export Not Started'
-                elif proj_img_path_error:
-                    folder_status = 'IMG Path Not Found'
-                elif proj_failed:
-                    folder_status = 'Export Failed'
-                elif check_result.get('missing'):
-                    folder_status = 'Missing IMG'
-                else:
-                    folder_status = 'Done'
-                set_folder_preview_status(_api, proj_dir, folder_status)
+                dprint(f'Export failed for {label_failed}')
+                ui.show_error(f'Export failed: {label_failed}')
+        else:
+            outputs.append(final_path(target))
+            if journal is not None:
+                journal.skeleton(proj, sk, 'done', output=final_path(target))
+            if single_file:
+                shown = target if (looks_like_file(target) and os.path.isfile(target)) else latest_file_in(os.path.dirname(target) if looks_like_file(target) else target, exts=['.mov', '.avi'])
+                ui.show_success('Export finished', os.path.basename(shown) if shown else 'Done.')
+            else:
+                ui.show_success('Export finished', f'Saved to folder: {target}')
 
-            # Update progress to reflect this project is done
-            progress.report_progress(proj_index / max(1, total_projs))
+        progress.report_progress(job_bounds[job_index])
 
-            if proj_canceled:
-                ui.show_info('Canceled', 'The export has been canceled by the user.')
-                return
+    trace_path = os.path.join(actual_proj_dir, f'{base_name}_trace.txt')
+
+    if proj_timeout or proj_img_path_error:
+        # Write trace with CLI log content, then move on — no missing image check
+        if proj_timeout:
+            _write_status_trace(trace_path, actual_proj, 'Export Not Started',
+                                f'No output file was detected after {proj_timeout_secs:.0f}s '
+                                f'({proj_attempts} attempt(s)). '
+                                'The Spine CLI may have launched but never started encoding.',
+                                cli_log_path=special_cli_log)
+        else:
+            _write_status_trace(trace_path, actual_proj, 'IMG Path Not Found',
+                                'Spine reported that the images path could not be found. '
+                                'Check that the images folder exists next to the project.',
+                                cli_log_path=special_cli_log)
+        try:
+            if special_cli_log and os.path.isfile(special_cli_log):
+                os.remove(special_cli_log)
+        except Exception: pass
+        check_result: dict = {}
+    elif proj_failed or proj_canceled:
+        check_result = {}
+        _write_status_trace(trace_path, actual_proj,
+                            'Canceled' if proj_canceled else 'Export Failed')
+    else:
+        # Successful export: run missing-image check and always write trace
+        progress.set_text(f'{proj_prefix}Checking for missing images...')
+        check_started = time.time()
+        check_result = check_missing_images_in_project(actual_proj, spine_exec, key_path=proj,
+                                                       canceled=lambda: progress.canceled,
+                                                       images_fingerprint=prep['images_fingerprint'])
+        if progress.canceled:
+            # The check was cut short, so its (empty) result says nothing about missing images
+            proj_canceled = True
+            _write_status_trace(trace_path, actual_proj, 'Canceled')
+        else:
+            write_missing_images_trace(trace_path, actual_proj, check_result)
+        BatchReport.add(timing, 'check', time.time() - check_started)
+
+    if proj_canceled:
+        folder_status = 'Canceled'
+    elif proj_timeout:
+        folder_status = 'Export Not Started'
+    elif proj_img_path_error:
+        folder_status = 'IMG Path Not Found'
+    elif proj_failed:
+        folder_status = 'Export Failed'
+    elif check_result.get('missing'):
+        folder_status = 'Missing IMG'
+    else:
+        folder_status = 'Done'
+    timing['status'] = folder_status
+
+    if journal is not None:
+        state = 'canceled' if proj_canceled else 'done' if folder_status in ('Done', 'Missing IMG') else 'failed'
+        journal.project(proj, state, status=folder_status, outputs=outputs, trace=final_path(trace_path))
+
+    export_state: Optional[ExportState] = opts.get('export_state')
+    if export_state is not None:
+        if folder_status == 'Done':
+            export_state.record(proj, prep['fingerprint'], outputs)
+        else:
+            export_state.forget(proj)
+
+    def tag_folder(move_secs: float = 0.0):
+        # Write Preview Status attribute for this project's folder
+        if move_secs:
+            BatchReport.add(timing, 'move_back', move_secs)
+        if api is not None and not proj_canceled:
+            with api_lock:
+                set_folder_preview_status(api, proj_dir, folder_status)
+
+    # Move exported files + trace back from the local mirror; the mirror itself is kept so
+    # the next run only syncs what changed. The folder is tagged once its outputs are back.
+    if staged_locally and os.path.isdir(actual_proj_dir):
+        if pipeline is not None:
+            pipeline.move_back(mirror_outputs + [trace_path], proj_dir, on_done=tag_folder)
+            return folder_status
+        progress.set_text(f'{proj_prefix}Moving exported files back...')
+        move_started = time.time()
+        move_outputs_back(mirror_outputs + [trace_path], proj_dir)
+        tag_folder(time.time() - move_started)
+        return folder_status
+    tag_folder()
+    return folder_status
+
+
+def export_worker(selected_files: List[str], width: int, height: int, fps: float, bg: str, single_file: bool, video_format: str, user_output_override: str, use_fixed_viewport: bool, center_viewport: bool, viewport_x: int, viewport_y: int, chosen_skeletons: Optional[List[str]], export_local: bool = False, profile: str = 'master', skip_unchanged: bool = False,
+                  journal: Optional[BatchJournal] = None) -> List[str]:
+    """Export the projects and return their Preview Status (or 'Canceled' / 'Skipped'), in order.
+
+    Every batch is recorded in a BatchJournal; pass the journal of an interrupted batch to
+    resume it (see resume_last_batch)."""
+    total_projs = len(selected_files)
+    progress = new_progress('Spine Export', infinite=(total_projs == 0))
+    progress.set_cancelable(True)
+    statuses: List[str] = []
+
+    spine_exec = get_spine_executable()
+    if not ensure_file_exists(spine_exec, 'Spine executable'):
+        progress.finish(); return statuses
+
+    # Set up attribute tracking (non-fatal if API unavailable, skipped in headless runs)
+    _api = None
+    try:
+        if ap is not None:
+            _api = ap.get_api()
+            dprint(f'API obtained: {_api}')
+            ensure_preview_status_attribute(_api)
+    except Exception as e:
+        dprint(f'Attribute API unavailable, status tagging disabled: {e}')
+        _api = None
+    api_lock = threading.Lock()
+
+    opts = dict(
+        width=width, height=height, fps=fps, bg=bg, single_file=single_file, video_format=video_format,
+        user_output_override=user_output_override, use_fixed_viewport=use_fixed_viewport,
+        center_viewport=center_viewport, viewport_x=viewport_x, viewport_y=viewport_y,
+        chosen_skeletons=chosen_skeletons, export_local=export_local, profile=profile,
+    )
+    dprint(f'Export profile: {profile} {export_profile(profile)}')
+    # Reports are named after the journal so a batch's report and journal are easy to pair up
+    report_name = time.strftime('%H%M%S')
+    if journal is None:
+        journal = BatchJournal.start(selected_files, dict(opts, skip_unchanged=skip_unchanged))
+        report_name = ''
+    opts['journal'] = journal
+    report_stem = os.path.splitext(os.path.basename(journal.path))[0]
+    report = BatchReport(f'{report_stem}_resumed_{report_name}' if report_name else report_stem)
+    opts['report'] = report
+    if skip_unchanged:
+        opts['export_state'] = ExportState()
+        opts['settings_key'] = export_settings_key(opts)
+
+    workers = get_parallel_export_count(total_projs)
+    dprint(f'Exporting {total_projs} project(s) with {workers} parallel job(s)')
+    batch = BatchProgress(progress, total_projs)
+    canceled = False
+
+    # Local-drive batches stage upcoming projects and move outputs back while others render
+    pipeline: Optional[StagingPipeline] = None
+    if export_local and total_projs > 1:
+        pipeline = StagingPipeline(selected_files, spine_exec, lookahead=workers + 1,
+                                   canceled=lambda: progress.canceled, stage_workers=min(2, workers),
+                                   export_state=opts.get('export_state'), settings_key=opts.get('settings_key', ''))
+        opts['pipeline'] = pipeline
+
+    def run_job(proj_index: int, proj: str) -> str:
+        key = f'{proj_index}:{proj}'
+        try:
+            return export_project(proj, proj_index, total_projs, opts, spine_exec, batch.job(key), _api, api_lock)
+        finally:
+            batch.finish_job(key)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_job, i, proj) for i, proj in enumerate(selected_files, start=1)]
+            for future in futures:
+                try:
+                    statuses.append(future.result())
+                    if statuses[-1] == 'Canceled':
+                        canceled = True
+                except Exception as e:
+                    statuses.append('Export Failed')
+                    dprint(f'Unexpected error during export: {e}')
+                    ui.show_error('Unexpected error during export', description=str(e))
+
+        if pipeline is not None:
+            pending = pipeline.pending_moves()
+            if pending:
+                progress.set_text(f'Moving exported files back ({pending} project(s) left)...')
+            pipeline.close()
+            pipeline = None
+
+        journal.end(canceled=canceled or progress.canceled)
+        _, report_csv = report.finish()
+        if canceled or progress.canceled:
+            ui.show_info('Canceled', 'The export has been canceled by the user. Use "Resume last batch" to continue it.')
+        elif skip_unchanged or total_projs > 1:
+            skipped = statuses.count('Skipped')
+            failed = sum(1 for st in statuses if st not in ('Done', 'Missing IMG', 'Skipped'))
+            summary = f'{len(statuses) - skipped} rendered, {skipped} skipped (unchanged)'
+            if failed:
+                summary += f', {failed} with problems'
+            dprint(f'Batch finished: {summary}')
+            ui.show_success('Batch export finished', summary)
+            if total_projs > 1:
+                show_batch_report(report, report_csv)
 
     except Exception as e:
         ui.show_error('Unexpected error during export', description=str(e))
     finally:
+        if pipeline is not None:
+            pipeline.close()
         progress.finish()
+    return statuses
 
-def find_spine_files_in_folders(folders: List[str]) -> List[str]:
-    """Return .spine files found inside each folder.
-    Scans recursively when the 'recursive_folder_scan' setting is enabled."""
-    recursive = bool(settings.get("recursive_folder_scan", False))
-    found = []
-    seen = set()
+SCAN_WORKERS = 8
+SCAN_PRUNE_DIRS = {'images', '.git'}
+SCAN_CACHE_MAX_ENTRIES = 200000
 
-    def _scan(dir_path: str):
-        try:
-            for name in sorted(os.listdir(dir_path)):
-                full = os.path.join(dir_path, name)
-                if name.lower().endswith('.spine') and os.path.isfile(full):
-                    if full not in seen:
-                        seen.add(full)
-                        found.append(full)
-                elif recursive and os.path.isdir(full):
-                    _scan(full)
-        except Exception as e:
-            dprint(f"Could not scan folder '{dir_path}': {e}")
+def _scan_cache_path() -> str:
+    return os.path.join(user_data_dir(), 'scan_cache.json')
+
+def _load_scan_cache() -> dict:
+    try:
+        with open(_scan_cache_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _store_scan_cache(cache: dict):
+    if len(cache) > SCAN_CACHE_MAX_ENTRIES:
+        newest = sorted(cache.items(), key=lambda item: item[1].get('seen', 0), reverse=True)
+        cache = dict(newest[:SCAN_CACHE_MAX_ENTRIES])
+    try:
+        tmp_path = _scan_cache_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, _scan_cache_path())
+    except OSError as e:
+        dprint(f'Could not write folder scan cache: {e}')
+
+def _prune_scan_dir(name: str) -> bool:
+    return name.lower() in SCAN_PRUNE_DIRS or _is_export_output(name, True)
+
+def _list_dir_cached(dir_path: str, cache: dict, lock: threading.Lock) -> Tuple[List[str], List[str]]:
+    """(.spine file names, subfolder names) of dir_path.
+
+    A folder's mtime changes whenever entries are added, removed or renamed in it, so an
+    unchanged mtime lets the cached listing stand in for a full scandir."""
+    key = os.path.normcase(os.path.abspath(dir_path))
+    mtime_ns = os.stat(dir_path).st_mtime_ns
+    with lock:
+        entry = cache.get(key)
+        if entry and entry.get('mtime_ns') == mtime_ns:
+            entry['seen'] = time.time()
+            return entry['spine'], entry['dirs']
+    spine_names, dir_names = [], []
+    with os.scandir(dir_path) as it:
+        for e in it:
+            try:
+                if e.is_dir():
+                    dir_names.append(e.name)
+                elif e.name.lower().endswith('.spine') and e.is_file():
+                    spine_names.append(e.name)
+            except OSError:
+                continue
+    with lock:
+        cache[key] = {'mtime_ns': mtime_ns, 'spine': spine_names, 'dirs': dir_names, 'seen': time.time()}
+    return spine_names, dir_names
+
+def scan_spine_files(folders: List[str], on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, List[str]]:
+    """Return {folder: .spine files inside it} for each folder.
+
+    Recurses when the 'recursive_folder_scan' setting is enabled, listing folders in
+    parallel and skipping export outputs, 'images' and '.git' folders. Listings are cached
+    between runs per folder mtime. on_progress(folders scanned, projects found) is called as
+    the scan goes."""
+    recursive = bool(settings.get('recursive_folder_scan', False))
+    cache = _load_scan_cache()
+    lock = threading.Lock()
+    found: Dict[str, List[str]] = {folder: [] for folder in folders}
+    scanned = total_found = 0
+
+    def scan(root: str, dir_path: str):
+        return root, dir_path, _list_dir_cached(dir_path, cache, lock)
+
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        pending = {executor.submit(scan, folder, folder) for folder in folders}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    root, dir_path, (spine_names, dir_names) = future.result()
+                except Exception as e:
+                    dprint(f"Could not scan folder: {e}")
+                    continue
+                scanned += 1
+                found[root].extend(os.path.join(dir_path, n) for n in spine_names)
+                total_found += len(spine_names)
+                if recursive:
+                    pending |= {executor.submit(scan, root, os.path.join(dir_path, n)) for n in dir_names if not _prune_scan_dir(n)}
+            if on_progress is not None:
+                on_progress(scanned, total_found)
+
+    _store_scan_cache(cache)
+    # Same order as a depth-first walk over sorted names
+    for root in found:
+        found[root].sort(key=lambda p: os.path.relpath(p, root).split(os.sep))
+    return found
 
-    for folder in folders:
-        _scan(folder)
+def find_spine_files_in_folders(folders: List[str], on_progress: Optional[Callable[[int, int], None]] = None) -> List[str]:
+    """Return .spine files found inside each folder.
+    Scans recursively when the 'recursive_folder_scan' setting is enabled."""
+    found, seen = [], set()
+    for files in scan_spine_files(folders, on_progress).values():
+        for full in files:
+            if full not in seen:
+                seen.add(full)
+                found.append(full)
     return found
 
-def show_batch_settings_dialog(export_local: bool, on_done: Callable):
+def show_batch_settings_dialog(export_local: bool, on_done: Callable, profile: Optional[str] = None, skip_unchanged: bool = False):
     """Show the export settings dialog for a batch run.
     Calls on_done(export_local, settings_dict) when the user clicks Export."""
     d = ap.Dialog()
@@ -922,10 +2581,11 @@ def show_batch_settings_dialog(export_local: bool, on_done: Callable):
     d.title = 'Batch Export Settings'
     d.add_info('Configure export settings for all projects in this batch.')
 
+    d.add_text('Profile\t').add_dropdown(profile or remembered_profile(), list(EXPORT_PROFILES), var='profile')
     d.add_text('FPS\t').add_input('60', var='fps', width=100)
     d.add_text('Background\t').add_dropdown('black', ['black', 'white', 'transparent'], var='bg_choice')
     d.add_text('Output\t').add_dropdown('single', ['single', 'separate-per-animation'], var='out_mode')
-    d.add_text('Format\t').add_dropdown('mov', ['mov', 'avi'], var='format')
+    d.add_text('Format\t').add_dropdown('mov', FORMAT_CHOICES, var='format')
     d.add_checkbox(False, var='fixed_viewport', text='Use Fixed Viewport (constant crop size)')
     d.add_text('Width\t').add_input('1920', var='res_w', width=100)
     d.add_text('Height\t').add_input('1080', var='res_h', width=100)
@@ -945,7 +2605,7 @@ def show_batch_settings_dialog(export_local: bool, on_done: Callable):
         bg = custom_hex if custom_hex else bg_choice
         mode = dialog.get_value('out_mode') or 'single'
         single = (mode == 'single')
-        fmt = dialog.get_value('format') or 'mov'
+        fmt = format_from_choice(dialog.get_value('format'))
         fixed = bool(dialog.get_value('fixed_viewport'))
         width = int(dialog.get_value('res_w') or 1920)
         height = int(dialog.get_value('res_h') or 1080)
@@ -953,12 +2613,15 @@ def show_batch_settings_dialog(export_local: bool, on_done: Callable):
         vx = int(dialog.get_value('viewport_x') or 0)
         vy = int(dialog.get_value('viewport_y') or 0)
         override = (dialog.get_value('output_override') or '').strip()
+        chosen_profile = dialog.get_value('profile') or BATCH_DEFAULTS['profile']
+        remember_profile(chosen_profile)
         dialog.close()
         on_done(export_local, {
             'fps': fps, 'bg': bg, 'single_file': single, 'video_format': fmt,
             'use_fixed_viewport': fixed, 'width': width, 'height': height,
             'center_viewport': center, 'viewport_x': vx, 'viewport_y': vy,
             'user_output_override': override, 'chosen_skeletons': None,
+            'profile': chosen_profile, 'skip_unchanged': skip_unchanged,
         })
 
     d.add_button('Export', callback=on_export)
@@ -966,10 +2629,11 @@ def show_batch_settings_dialog(export_local: bool, on_done: Callable):
     d.show()
 
 
-def show_batch_confirm_dialog(spine_files: List[str], on_confirm: Callable):
+def show_batch_confirm_dialog(spine_files: List[str], on_confirm: Callable, on_resume: Optional[Callable[[], None]] = None):
     """Show a confirmation dialog listing found .spine files before batch export.
-    Calls on_confirm(export_local, settings_or_none) when the user is ready to export.
-    settings_or_none is None when using default settings, or a dict of export settings."""
+    Calls on_confirm(export_local, settings) when the user is ready to export.
+    settings is BATCH_DEFAULTS with the chosen profile, or the custom export settings.
+    When the last batch was interrupted and on_resume is given, offers to resume it instead."""
     d = ap.Dialog()
     d.icon = ctx.icon
     d.title = 'Batch Spine Export'
@@ -983,7 +2647,9 @@ def show_batch_confirm_dialog(spine_files: List[str], on_confirm: Callable):
         d.add_text(f'{folder_name} / {os.path.basename(f)}')
 
     d.add_empty()
+    d.add_text('Profile\t').add_dropdown(remembered_profile(), list(EXPORT_PROFILES), var='profile')
     d.add_checkbox(True, var='export_local', text='Export on Local Drive')
+    d.add_checkbox(bool(settings.get('skip_unchanged', True)), var='skip_unchanged', text='Skip projects unchanged since their last export')
     d.add_checkbox(False, var='custom_settings', text='Configure export settings before starting')
 
     d.add_empty()
@@ -991,13 +2657,28 @@ def show_batch_confirm_dialog(spine_files: List[str], on_confirm: Callable):
     def on_export(dlg: ap.Dialog):
         exp_local = bool(dlg.get_value('export_local'))
         use_custom = bool(dlg.get_value('custom_settings'))
+        skip = bool(dlg.get_value('skip_unchanged'))
+        profile = dlg.get_value('profile') or BATCH_DEFAULTS['profile']
+        settings.set('skip_unchanged', skip)
+        remember_profile(profile)
         dlg.close()
         if use_custom:
-            show_batch_settings_dialog(exp_local, on_confirm)
+            show_batch_settings_dialog(exp_local, on_confirm, profile, skip)
         else:
-            on_confirm(exp_local, None)
+            on_confirm(exp_local, dict(BATCH_DEFAULTS, profile=profile, skip_unchanged=skip))
 
     d.add_button('Export All', callback=on_export)
+
+    last = BatchJournal.load_last() if on_resume is not None else None
+    if last is not None and last.resumable:
+        left, total = len(last.pending_projects()), len(last.batch.get('projects', []))
+        d.add_info(f'The last batch was interrupted with {left} of {total} project(s) left.')
+
+        def on_resume_clicked(dlg: ap.Dialog):
+            dlg.close()
+            on_resume()
+
+        d.add_button('Resume last batch', callback=on_resume_clicked)
     d.add_button('Cancel', callback=lambda dlg: dlg.close())
     d.show()
 
@@ -1033,10 +2714,11 @@ def show_settings_and_run(chosen_skeletons: List[str]):
     d.title = 'Spine Export Settings'
     d.add_info('Step 2/2 â Configure your export (all animations of each skeleton will be exported).')
 
+    d.add_text('Profile\t').add_dropdown(remembered_profile(), list(EXPORT_PROFILES), var='profile')
     d.add_text('FPS\t').add_input('60', var='fps', width=100)
     d.add_text('Background\t').add_dropdown('black', ['black', 'white', 'transparent'], var='bg_choice')
     d.add_text('Output\t').add_dropdown('single', ['single', 'separate-per-animation'], var='out_mode')
-    d.add_text('Format\t').add_dropdown('mov', ['mov', 'avi'], var='format')
+    d.add_text('Format\t').add_dropdown('mov', FORMAT_CHOICES, var='format')
 
     d.add_checkbox(True, var='export_local', text='Export on Local Drive')
     d.add_checkbox(False, var='fixed_viewport', text='Use Fixed Viewport (constant crop size)')
@@ -1064,7 +2746,8 @@ def show_settings_and_run(chosen_skeletons: List[str]):
 
         mode = dialog.get_value('out_mode') or 'single'
         single = (mode == 'single')
-        fmt = dialog.get_value('format') or 'mov'
+        fmt = format_from_choice(dialog.get_value('format'))
+        profile = dialog.get_value('profile') or BATCH_DEFAULTS['profile']
 
         fixed = bool(dialog.get_value('fixed_viewport'))
         width = int(dialog.get_value('res_w') or 1920)
@@ -1081,8 +2764,9 @@ def show_settings_and_run(chosen_skeletons: List[str]):
             ui.show_info('No .spine file selected', description='Select at least one .spine project.')
             return
 
+        remember_profile(profile)
         dialog.close()
-        ctx.run_async(lambda: export_worker(sel, width, height, fps, bg, single, fmt, override, fixed, center, vx, vy, chosen_skeletons if chosen_skeletons else None, export_local=exp_local))
+        ctx.run_async(lambda: export_worker(sel, width, height, fps, bg, single, fmt, override, fixed, center, vx, vy, chosen_skeletons if chosen_skeletons else None, export_local=exp_local, profile=profile))
 
     d.add_button('Export', callback=on_export)
     d.show()
@@ -1132,14 +2816,15 @@ def main():
 
     elif folders:
         def scan_folders():
-            progress = ap.Progress('Scanning folders...', infinite=True)
+            progress = new_progress('Scanning folders...', infinite=True)
             progress.set_cancelable(False)
 
+            def report_scan(scanned: int, found: int):
+                progress.set_text(f'Scanned {scanned} folder(s)  \u2022  {found} Spine project(s) found')
+
             folders_with_files: Dict[str, List[str]] = {}
             empty_folders: List[str] = []
-            for folder in folders:
-                progress.set_text(f'Scanning: {os.path.basename(folder)}')
-                files = find_spine_files_in_folders([folder])
+            for folder, files in scan_spine_files(folders, report_scan).items():
                 if files:
                     folders_with_files[folder] = files
                 else:
@@ -1176,9 +2861,12 @@ def main():
                     s['viewport_x'], s['viewport_y'],
                     s.get('chosen_skeletons'),
                     export_local=export_local,
+                    profile=s.get('profile', BATCH_DEFAULTS['profile']),
+                    skip_unchanged=bool(s.get('skip_unchanged', False)),
                 )
 
-            show_batch_confirm_dialog(all_spine_files, lambda loc, cfg: ctx.run_async(lambda: do_batch(loc, cfg)))
+            show_batch_confirm_dialog(all_spine_files, lambda loc, cfg: ctx.run_async(lambda: do_batch(loc, cfg)),
+                                      on_resume=lambda: ctx.run_async(resume_last_batch))
 
         ctx.run_async(scan_folders)
 
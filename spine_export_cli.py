@@ -0,0 +1,175 @@
+# spine_export_cli.py
+# Headless batch runner for spine_export: exports Spine projects without the Anchorpoint UI,
+# e.g. overnight on a render box or from a scheduled task.
+#
+#   python spine_export_cli.py D:/Projects/Characters --recursive --profile review --skip-unchanged
+#   python -m spine_export_cli --job nightly.json
+#   python spine_export_cli.py --resume
+#
+# A job file takes the same options as the command line, flags given on the command line win:
+#   {
+#     "inputs": ["D:/Projects/Characters"],
+#     "recursive": true,
+#     "spine": "C:/Program Files/Spine/Spine.com",
+#     "export_local": true,
+#     "skip_unchanged": true,
+#     "parallel": 4,
+#     "export": {"profile": "review", "fps": 30, "video_format": "mov", "width": 1920, "height": 1080}
+#   }
+#
+# Exit code: 0 when every project ended Done, Missing IMG or Skipped, 1 if any did not,
+# 2 for invalid arguments, 130 when canceled with Ctrl+C.
+
+import argparse, json, os, signal, sys, threading
+from typing import Dict, List, Optional
+
+import spine_export as se
+
+OK_STATUSES = ('Done', 'Missing IMG', 'Skipped')
+EXPORT_KEYS = tuple(se.BATCH_DEFAULTS.keys())
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description='Export Spine projects to video without Anchorpoint.')
+    p.add_argument('inputs', nargs='*', help='.spine files or folders containing Spine projects')
+    p.add_argument('--job', help='JSON job file with inputs and export options')
+    p.add_argument('--settings', help='JSON file with spine_export settings (e.g. max_parallel_exports)')
+    p.add_argument('--spine', help='path to the Spine executable (Spine.com on Windows)')
+    p.add_argument('--recursive', action='store_true', default=None, help='scan folders recursively')
+    p.add_argument('--profile', choices=list(se.EXPORT_PROFILES), help='export profile')
+    p.add_argument('--format', dest='video_format', choices=list(se.VIDEO_FORMATS + se.IMAGE_SEQUENCE_FORMATS))
+    p.add_argument('--fps', type=float)
+    p.add_argument('--width', type=int)
+    p.add_argument('--height', type=int)
+    p.add_argument('--bg', help="'black', 'white', 'transparent' or '#rrggbb'")
+    p.add_argument('--separate', action='store_true', default=None, help='one file per animation')
+    p.add_argument('--fixed-viewport', dest='use_fixed_viewport', action='store_true', default=None)
+    p.add_argument('--output', dest='user_output_override', help='output folder or file instead of the project folder')
+    p.add_argument('--skeleton', dest='chosen_skeletons', action='append', help='export only this skeleton (repeatable)')
+    p.add_argument('--local', dest='export_local', action='store_true', default=None, help='render from a local mirror')
+    p.add_argument('--skip-unchanged', action='store_true', default=None, help='skip projects unchanged since their last export')
+    p.add_argument('--parallel', type=int, help='parallel exports (0 = automatic)')
+    p.add_argument('--resume', action='store_true', help='continue the last interrupted batch with its settings')
+    p.add_argument('--progress-interval', type=float, default=5.0, help='seconds between progress lines')
+    return p.parse_args(argv)
+
+
+def load_job(args: argparse.Namespace) -> dict:
+    """Job file contents overlaid with the options given on the command line."""
+    job: dict = {}
+    if args.job:
+        with open(args.job, 'r', encoding='utf-8') as f:
+            job = json.load(f)
+    export = dict(se.BATCH_DEFAULTS)
+    export.update(job.get('export') or {})
+    for key in EXPORT_KEYS:
+        value = getattr(args, key, None)
+        if value is not None:
+            export[key] = value
+    if args.separate:
+        export['single_file'] = False
+    job['export'] = export
+    if args.inputs:
+        job['inputs'] = args.inputs
+    for key in ('recursive', 'spine', 'export_local', 'skip_unchanged', 'parallel'):
+        value = getattr(args, key)
+        if value is not None:
+            job[key] = value
+    return job
+
+
+def collect_projects(inputs: List[str]) -> List[str]:
+    files: List[str] = []
+    folders: List[str] = []
+    for p in map(os.path.abspath, inputs):
+        if os.path.isdir(p):
+            folders.append(p)
+        elif os.path.isfile(p) and p.lower().endswith('.spine'):
+            files.append(p)
+        else:
+            se.dprint(f'Skipping {p}: not a .spine file or folder')
+    if folders:
+        files += se.find_spine_files_in_folders(folders, on_progress=None)
+    unique: Dict[str, None] = dict.fromkeys(files)
+    return list(unique)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        job = load_job(args)
+    except (OSError, ValueError) as e:
+        print(f'Could not read job file: {e}', file=sys.stderr)
+        return 2
+    if not job.get('inputs') and not args.resume:
+        print('Nothing to export: pass .spine files or folders, or a job file with "inputs".', file=sys.stderr)
+        return 2
+
+    # Console sinks instead of Anchorpoint toasts, progress dialogs and shared settings
+    overrides = {}
+    if job.get('spine'):
+        overrides['spine_path_win'] = overrides['spine_path_mac'] = job['spine']
+    if job.get('recursive') is not None:
+        overrides['recursive_folder_scan'] = bool(job['recursive'])
+    if job.get('parallel') is not None:
+        overrides['max_parallel_exports'] = int(job['parallel'])
+    cancel = threading.Event()
+    se.settings = se.HeadlessSettings(args.settings, overrides)
+    se.ui = se.HeadlessUI()
+    se.new_progress = lambda title, infinite=False: se.HeadlessProgress(title, infinite, cancel, args.progress_interval)
+
+    if args.resume:
+        journal = se.BatchJournal.load_last()
+        projects = journal.pending_projects() if journal is not None and journal.resumable else []
+        if not projects:
+            se.dprint('Nothing to resume: the last batch export finished completely.')
+            return 0
+    else:
+        projects = collect_projects(job['inputs'])
+        if not projects:
+            se.dprint('No Spine projects found.')
+            return 0
+    se.dprint(f'{len(projects)} Spine project(s) to export')
+
+    export = job['export']
+    result: Dict[str, List[str]] = {}
+
+    def run():
+        if args.resume:
+            result['statuses'] = se.resume_last_batch() or []
+            return
+        result['statuses'] = se.export_worker(
+            projects,
+            export['width'], export['height'], export['fps'], export['bg'],
+            export['single_file'], export['video_format'], export['user_output_override'],
+            export['use_fixed_viewport'], export['center_viewport'],
+            export['viewport_x'], export['viewport_y'],
+            export.get('chosen_skeletons'),
+            export_local=bool(job.get('export_local', False)),
+            profile=export.get('profile', se.BATCH_DEFAULTS['profile']),
+            skip_unchanged=bool(job.get('skip_unchanged', False)),
+        )
+
+    def on_interrupt(signum, frame):
+        if cancel.is_set():
+            raise KeyboardInterrupt
+        se.dprint('Canceling after the running Spine exports stop (Ctrl+C again to abort)...')
+        cancel.set()
+
+    signal.signal(signal.SIGINT, on_interrupt)
+    # The export runs on a worker thread so Ctrl+C is handled promptly on every platform
+    worker = threading.Thread(target=run, name='spine-export')
+    worker.start()
+    while worker.is_alive():
+        worker.join(0.5)
+
+    statuses = result.get('statuses', [])
+    for proj, status in zip(projects, statuses):
+        se.dprint(f'{status:<20} {proj}')
+    if cancel.is_set():
+        return 130
+    return 0 if statuses and all(st in OK_STATUSES for st in statuses) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,6 +10,11 @@ def store_settings(dialog: ap.Dialog):
     settings.set("spine_path_win", dialog.get_value("spine_path_win"))
     settings.set("spine_path_mac", dialog.get_value("spine_path_mac"))
     settings.set("recursive_folder_scan", dialog.get_value("recursive_folder_scan"))
+    settings.set("analysis_cache_hash", dialog.get_value("analysis_cache_hash"))
+    try:
+        settings.set("max_parallel_exports", max(0, int(dialog.get_value("max_parallel_exports") or 0)))
+    except ValueError:
+        settings.set("max_parallel_exports", 0)
     settings.store()
     ui.show_success("Spine path saved")
     dialog.close()
@@ -17,6 +22,14 @@ def store_settings(dialog: ap.Dialog):
 default_win = settings.get("spine_path_win", "C:/Program Files/Spine/Spine.com")
 default_mac = settings.get("spine_path_mac", "/Applications/Spine.app/Contents/MacOS/Spine")
 default_recursive = settings.get("recursive_folder_scan", False)
+default_parallel = settings.get("max_parallel_exports", 0)
+default_cache_hash = settings.get("analysis_cache_hash", False)
+
+def refresh_skeleton_cache(dialog: ap.Dialog):
+    # Bumping the generation invalidates every cached project analysis at once
+    settings.set("analysis_cache_generation", int(settings.get("analysis_cache_generation", 0)) + 1)
+    settings.store()
+    ui.show_success("Skeleton cache refreshed", "Projects will be probed again on the next export")
 
 dialog = ap.Dialog()
 dialog.icon = ctx.icon
@@ -30,5 +43,15 @@ dialog.add_empty()
 dialog.add_info("Folder scan behaviour")
 dialog.add_checkbox(default_recursive, var="recursive_folder_scan", text="Scan subfolders recursively when selecting folders")
 
+dialog.add_empty()
+dialog.add_info("Batch export")
+dialog.add_text("Parallel exports").add_input(str(default_parallel), var="max_parallel_exports", width=60)
+dialog.add_info("Number of Spine CLI exports running at the same time. 0 picks a value from CPU cores and RAM.")
+
+dialog.add_empty()
+dialog.add_info("Skeleton cache")
+dialog.add_checkbox(default_cache_hash, var="analysis_cache_hash", text="Also compare file contents (slower, for tools that keep modification times)")
+
 dialog.add_button("Save", callback=store_settings)
+dialog.add_button("Refresh skeleton cache", callback=refresh_skeleton_cache)
 dialog.show()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Per-user folders for the local state of the actions in this repository (PNG
+# cache, metadata index, Spine export history). Nothing here is shared with the team.
+
+def _base(cache):
+    if sys.platform.startswith("win"):
+        return os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "Anchorpoint")
+    if sys.platform == "darwin":
+        folder = "~/Library/Caches" if cache else "~/Library/Application Support"
+        return os.path.join(os.path.expanduser(folder), "Anchorpoint")
+    if cache:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "anchorpoint")
+
+def user_data_dir(*parts):
+    """Folder for data that should survive between runs. Not created here."""
+    return os.path.join(_base(False), *parts)
+
+def user_cache_dir(*parts):
+    """Folder for data that can be regenerated at any time. Not created here."""
+    return os.path.join(_base(True), *parts)
@@ -0,0 +1,154 @@
+import os
+import struct
+import threading
+
+# Reads video metadata straight from the MP4/MOV box structure. Only box headers and
+# the small moov tables are read; mdat (the media data) is skipped with a seek, so a
+# multi-GB file costs a few KB of I/O wherever its moov box is stored.
+
+CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+MAX_TABLE_BYTES = 64 * 1024 * 1024
+
+def _boxes(f, start, end):
+    """Yield (type, payload_start, box_end) for the boxes between start and end."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            (size,) = struct.unpack(">Q", large)
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size:
+            return
+        yield box_type, pos + header_size, pos + size
+        pos += size
+
+def _find(f, start, end, box_type):
+    for found_type, payload, box_end in _boxes(f, start, end):
+        if found_type == box_type:
+            return payload, box_end
+    return None
+
+def _read_at(f, offset, size):
+    f.seek(offset)
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of box")
+    return data
+
+def _media_header(f, payload):
+    """Return (timescale, duration) from an mvhd/mdhd box."""
+    version = _read_at(f, payload, 1)[0]
+    if version == 1:
+        return struct.unpack(">IQ", _read_at(f, payload + 20, 12))
+    return struct.unpack(">II", _read_at(f, payload + 12, 8))
+
+def _sample_bytes(f, payload, box_end):
+    sample_size, sample_count = struct.unpack(">II", _read_at(f, payload + 4, 8))
+    if sample_size:
+        return sample_size * sample_count
+    table_size = min(sample_count * 4, box_end - payload - 12, MAX_TABLE_BYTES)
+    table = _read_at(f, payload + 12, table_size)
+    return sum(struct.unpack(f">{table_size // 4}I", table))
+
+def _time_to_sample(f, payload):
+    """Return (sample_count, total_delta) from an stts box."""
+    (entry_count,) = struct.unpack(">I", _read_at(f, payload + 4, 4))
+    table = _read_at(f, payload + 8, entry_count * 8)
+    samples = total = 0
+    for count, delta in struct.iter_unpack(">II", table):
+        samples += count
+        total += count * delta
+    return samples, total
+
+def _video_track(f, trak, trak_end):
+    mdia = _find(f, trak, trak_end, b"mdia")
+    if not mdia:
+        return None
+    hdlr = _find(f, mdia[0], mdia[1], b"hdlr")
+    if not hdlr or _read_at(f, hdlr[0] + 8, 4) != b"vide":
+        return None
+
+    info = {"width": 0, "height": 0, "frame_rate": None, "bit_rate": None, "duration": None}
+
+    tkhd = _find(f, trak, trak_end, b"tkhd")
+    if tkhd:
+        width, height = struct.unpack(">II", _read_at(f, tkhd[1] - 8, 8))
+        info["width"], info["height"] = width >> 16, height >> 16
+
+    timescale = duration = 0
+    mdhd = _find(f, mdia[0], mdia[1], b"mdhd")
+    if mdhd:
+        timescale, duration = _media_header(f, mdhd[0])
+        if timescale and duration:
+            info["duration"] = duration * 1000.0 / timescale
+
+    minf = _find(f, mdia[0], mdia[1], b"minf")
+    stbl = _find(f, minf[0], minf[1], b"stbl") if minf else None
+    if not stbl:
+        return info
+
+    stsd = _find(f, stbl[0], stbl[1], b"stsd")
+    if stsd:
+        # First visual sample entry: 8 byte box header, 8 bytes of sample entry, 16 predefined/reserved
+        coded_width, coded_height = struct.unpack(">HH", _read_at(f, stsd[0] + 8 + 8 + 8 + 16, 4))
+        if coded_width and coded_height:
+            info["width"], info["height"] = coded_width, coded_height
+
+    stts = _find(f, stbl[0], stbl[1], b"stts")
+    if stts and timescale:
+        samples, total_delta = _time_to_sample(f, stts[0])
+        if samples and total_delta:
+            info["frame_rate"] = samples * timescale / float(total_delta)
+
+    stsz = _find(f, stbl[0], stbl[1], b"stsz")
+    if stsz and info["duration"]:
+        info["bit_rate"] = _sample_bytes(f, stsz[0], stsz[1]) * 8 * 1000.0 / info["duration"]
+
+    return info
+
+def probe_mp4(file_path):
+    """Return width, height, frame_rate, bit_rate (bps) and duration (ms) of the first video
+    track of an MP4/MOV file, or None if no video track can be found in the box headers."""
+    with open(file_path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        moov = _find(f, 0, file_size, b"moov")
+        if not moov:
+            return None
+        for box_type, payload, box_end in _boxes(f, moov[0], moov[1]):
+            if box_type == b"trak":
+                info = _video_track(f, payload, box_end)
+                if info:
+                    return info
+    return None
+
+def call_with_timeout(func, args, timeout):
+    """Run func(*args) on a daemon thread and give up after timeout seconds.
+
+    Returns (finished, result). A stalled call keeps running in the background but no
+    longer blocks the caller."""
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = func(*args)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return False, None
+    if "error" in outcome:
+        raise outcome["error"]
+    return True, outcome.get("result")